@@ -17,16 +17,21 @@ Key Concepts You'll Learn:
 import pandas as pd
 import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
-def load_processed_data(filepath='data/campaign_data_processed.csv'):
+# Metric columns shown in the console segment reports
+_REPORT_COLUMNS = ['revenue', 'cost', 'roas', 'ctr', 'cpc', 'conversions']
+
+def load_processed_data(filepath='data/campaign_data_processed.parquet'):
     """
     Load the processed campaign data.
     
     Parameters:
-    - filepath: Path to the processed CSV file
+    - filepath: Path to the processed Parquet or CSV file (a missing Parquet
+      file falls back to the CSV export of the same name)
     
     Returns:
     - DataFrame with processed campaign data
@@ -34,9 +39,34 @@ def load_processed_data(filepath='data/campaign_data_processed.csv'):
     
     print("📂 Loading processed campaign data...")
     
+    csv_path = os.path.splitext(filepath)[0] + '.csv'
+    if filepath.endswith('.parquet') and not os.path.exists(filepath) and os.path.exists(csv_path):
+        filepath = csv_path
+    
     try:
-        df = pd.read_csv(filepath)
-        df['date'] = pd.to_datetime(df['date'])
+        if filepath.endswith('.parquet'):
+            df = pd.read_parquet(filepath, engine='pyarrow')
+        else:
+            # The Arrow parser is multithreaded and parses dates during the read
+            df = pd.read_csv(filepath, engine='pyarrow', parse_dates=['date'])
+        
+        # Keep rows in date order, so the segment tables (grouped in order of
+        # appearance) come out in a stable order
+        df = df.sort_values('date', kind='stable', ignore_index=True)
+        
+        # Low-cardinality dimensions group on integer codes as categoricals
+        for col in ('campaign_id', 'campaign_name', 'campaign_type', 'device', 'location'):
+            df[col] = df[col].astype('category')
+        
+        # Halve the width of the metric columns. Counts can carry fractional
+        # values after outlier capping, so only whole-number columns become int32
+        for col in ('impressions', 'clicks', 'conversions'):
+            values = df[col].to_numpy()
+            is_whole = np.array_equal(values, np.floor(values))
+            df[col] = df[col].astype('int32' if is_whole else 'float32')
+        for col in ('cost', 'revenue'):
+            df[col] = df[col].astype('float32')
+        
         print(f"✅ Successfully loaded {len(df):,} records")
         return df
     except FileNotFoundError:
@@ -44,26 +74,134 @@ def load_processed_data(filepath='data/campaign_data_processed.csv'):
         print("💡 Please run data_processing.py first to create the processed data")
         return None
 
-def calculate_overall_kpis(df):
+def _aggregate_base(df, backend='pandas'):
     """
-    Calculate overall KPIs for the entire dataset.
+    Aggregate the raw rows once at the finest grain used by any analysis.
+    
+    Every segment summary (campaign, device, location, date) is a sum over
+    these keys, so the coarser cubes can be rolled up from this much smaller
+    frame instead of re-scanning the raw data.
     
     Parameters:
     - df: Input DataFrame
+    - backend: 'pandas', or 'cudf' to run this scan on a GPU for large inputs
+      (falls back to pandas when cuDF is not installed)
     
     Returns:
-    - Dictionary with overall KPIs
+    - DataFrame with base metric sums per date/campaign/device/location
+      (rows with a missing dimension keep their own group, so rollups over the
+      other dimensions still cover every row)
     """
     
-    print("\n📊 Calculating Overall KPIs...")
-    print("=" * 50)
+    keys = ['date', 'campaign_id', 'campaign_name', 'campaign_type', 'device', 'location']
+    metrics = {
+        'impressions': 'sum',
+        'clicks': 'sum',
+        'conversions': 'sum',
+        'cost': 'sum',
+        'revenue': 'sum'
+    }
+    
+    # The rows store float32 metrics to save memory, but sums over millions of
+    # rows need float64 accumulators to keep the cents; every rollup is built
+    # from this cube, so upcasting here carries float64 totals through
+    df = df[keys + list(metrics)].astype({col: np.float64 for col in metrics if df[col].dtype == np.float32})
+    
+    if backend == 'cudf':
+        try:
+            import cudf
+        except ImportError:
+            print("⚠️ cuDF is not installed, aggregating with pandas instead")
+        else:
+            # Ship the categorical dimensions as their integer codes (-1 for a
+            # missing value, so those rows keep a group of their own) and
+            # restore the categories on the host. sort=True keeps date order
+            dimensions = keys[1:]
+            codes = df.assign(**{col: df[col].cat.codes for col in dimensions})
+            base = cudf.from_pandas(codes).groupby(keys, sort=True, dropna=False).agg(metrics).reset_index().to_pandas()
+            return base.assign(**{
+                col: pd.Categorical.from_codes(base[col], categories=df[col].cat.categories)
+                for col in dimensions
+            })
+    
+    return df.groupby(keys, sort=False, observed=True, dropna=False).agg(metrics).reset_index()
+
+def _daily_aggregate(df):
+    """
+    Aggregate the base metrics to one row per date.
+    
+    The result is sorted by date whatever the input row order, since the
+    moving averages and week-over-week trends depend on it; sorting the
+    one-row-per-day result is cheap.
     
-    # Aggregate metrics
-    total_impressions = df['impressions'].sum()
-    total_clicks = df['clicks'].sum()
-    total_conversions = df['conversions'].sum()
-    total_cost = df['cost'].sum()
-    total_revenue = df['revenue'].sum()
+    Parameters:
+    - df: Input DataFrame or base cube from _aggregate_base
+    
+    Returns:
+    - DataFrame with daily impressions, clicks, conversions, cost and revenue sums
+    """
+    
+    return df.groupby('date', sort=True).agg({
+        'impressions': 'sum',
+        'clicks': 'sum',
+        'conversions': 'sum',
+        'cost': 'sum',
+        'revenue': 'sum'
+    }).reset_index()
+
+def _safe_divide(numerator, denominator):
+    """
+    Divide two columns element-wise without materializing infinities.
+    
+    Parameters:
+    - numerator: Series or array of numerators
+    - denominator: Series or array of denominators
+    
+    Returns:
+    - NumPy array with the ratio, or 0 where the denominator is not positive
+    """
+    
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
+
+def _add_kpis(performance):
+    """
+    Add the derived KPI columns to an aggregated performance frame.
+    
+    Values are left unrounded; rounding is done when results are printed.
+    
+    Parameters:
+    - performance: DataFrame with impressions, clicks, conversions, cost and revenue sums
+    
+    Returns:
+    - The same DataFrame with ctr, cpc, cpa, roas and conversion_rate columns
+    """
+    
+    performance['ctr'] = _safe_divide(performance['clicks'], performance['impressions']) * 100
+    performance['cpc'] = _safe_divide(performance['cost'], performance['clicks'])
+    performance['cpa'] = _safe_divide(performance['cost'], performance['conversions'])
+    performance['roas'] = _safe_divide(performance['revenue'], performance['cost'])
+    performance['conversion_rate'] = _safe_divide(performance['conversions'], performance['clicks']) * 100
+    
+    return performance
+
+def calculate_overall_kpis(df, verbose=True):
+    """
+    Calculate overall KPIs for the entire dataset.
+    
+    Parameters:
+    - df: Input DataFrame or base cube from _aggregate_base
+    - verbose: Print the KPIs when True
+    
+    Returns:
+    - Dictionary with overall KPIs
+    """
+    
+    # Aggregate metrics in a single reduction, accumulating in float64
+    # so the float32 input columns keep full precision at the totals
+    totals = df[['impressions', 'clicks', 'conversions', 'cost', 'revenue']].to_numpy(dtype=np.float64).sum(axis=0)
+    total_impressions, total_clicks, total_conversions, total_cost, total_revenue = totals
     
     # Calculate KPIs
     overall_ctr = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0
@@ -85,205 +223,193 @@ def calculate_overall_kpis(df):
         'conversion_rate': overall_conversion_rate
     }
     
-    # Print results
-    print(f"📈 Overall Performance:")
-    print(f"   Impressions: {total_impressions:,}")
-    print(f"   Clicks: {total_clicks:,}")
-    print(f"   Conversions: {total_conversions:,}")
-    print(f"   Cost: ${total_cost:,.2f}")
-    print(f"   Revenue: ${total_revenue:,.2f}")
-    print(f"\n🎯 Key Performance Indicators:")
-    print(f"   CTR: {overall_ctr:.2f}%")
-    print(f"   CPC: ${overall_cpc:.2f}")
-    print(f"   CPA: ${overall_cpa:.2f}")
-    print(f"   ROAS: {overall_roas:.2f}x")
-    print(f"   Conversion Rate: {overall_conversion_rate:.2f}%")
+    if verbose:
+        print("\n📊 Calculating Overall KPIs...")
+        print("=" * 50)
+        
+        print(f"📈 Overall Performance:")
+        print(f"   Impressions: {total_impressions:,}")
+        print(f"   Clicks: {total_clicks:,}")
+        print(f"   Conversions: {total_conversions:,}")
+        print(f"   Cost: ${total_cost:,.2f}")
+        print(f"   Revenue: ${total_revenue:,.2f}")
+        print(f"\n🎯 Key Performance Indicators:")
+        print(f"   CTR: {overall_ctr:.2f}%")
+        print(f"   CPC: ${overall_cpc:.2f}")
+        print(f"   CPA: ${overall_cpa:.2f}")
+        print(f"   ROAS: {overall_roas:.2f}x")
+        print(f"   Conversion Rate: {overall_conversion_rate:.2f}%")
     
     return kpis
 
-def analyze_campaign_performance(df):
+def _print_campaign_summary(campaign_performance):
+    """
+    Print the top campaigns by revenue.
+    
+    Parameters:
+    - campaign_performance: Campaign performance summary
+    """
+    
+    print("\n🎯 Campaign Performance Analysis...")
+    print("=" * 50)
+    
+    # Only the top rows need ordering
+    print("🏆 Top Performing Campaigns by Revenue:")
+    print(campaign_performance.nlargest(3, 'revenue').to_string(
+        columns=['campaign_name', 'campaign_type'] + _REPORT_COLUMNS,
+        index=False, float_format='{:,.2f}'.format
+    ))
+
+def analyze_campaign_performance(df, verbose=True):
     """
     Analyze performance by campaign.
     
     Parameters:
-    - df: Input DataFrame
+    - df: Input DataFrame or base cube from _aggregate_base
+    - verbose: Print the summary when True
     
     Returns:
     - DataFrame with campaign performance summary
     """
     
-    print("\n🎯 Campaign Performance Analysis...")
-    print("=" * 50)
-    
-    # Group by campaign and calculate metrics
-    campaign_performance = df.groupby(['campaign_id', 'campaign_name', 'campaign_type']).agg({
+    # Group by campaign and calculate metrics and KPIs
+    campaign_performance = _add_kpis(df.groupby(['campaign_id', 'campaign_name', 'campaign_type'], observed=True, sort=False).agg({
         'impressions': 'sum',
         'clicks': 'sum',
         'conversions': 'sum',
         'cost': 'sum',
         'revenue': 'sum'
-    }).reset_index()
+    }).reset_index())
     
-    # Calculate KPIs
-    campaign_performance['ctr'] = (campaign_performance['clicks'] / campaign_performance['impressions'] * 100).round(2)
-    campaign_performance['cpc'] = (campaign_performance['cost'] / campaign_performance['clicks']).round(2)
-    campaign_performance['cpa'] = (campaign_performance['cost'] / campaign_performance['conversions']).round(2)
-    campaign_performance['roas'] = (campaign_performance['revenue'] / campaign_performance['cost']).round(2)
-    campaign_performance['conversion_rate'] = (campaign_performance['conversions'] / campaign_performance['clicks'] * 100).round(2)
+    if verbose:
+        _print_campaign_summary(campaign_performance)
     
-    # Handle division by zero
-    campaign_performance = campaign_performance.replace([np.inf, -np.inf], 0)
+    return campaign_performance
+
+def _print_device_summary(device_performance):
+    """
+    Print every device ordered by revenue.
     
-    # Sort by revenue
-    campaign_performance = campaign_performance.sort_values('revenue', ascending=False)
+    Parameters:
+    - device_performance: Device performance summary
+    """
     
-    # Print results
-    print("🏆 Top Performing Campaigns by Revenue:")
-    for _, row in campaign_performance.head(3).iterrows():
-        print(f"\n   {row['campaign_name']} ({row['campaign_type']})")
-        print(f"   Revenue: ${row['revenue']:,.2f} | Cost: ${row['cost']:,.2f} | ROAS: {row['roas']:.2f}x")
-        print(f"   CTR: {row['ctr']:.2f}% | CPC: ${row['cpc']:.2f} | Conversions: {row['conversions']:,}")
+    print("\n📱 Device Performance Analysis...")
+    print("=" * 50)
     
-    return campaign_performance
+    print("📱 Device Performance Summary:")
+    print(device_performance.sort_values('revenue', ascending=False).to_string(
+        columns=['device'] + _REPORT_COLUMNS,
+        index=False, float_format='{:,.2f}'.format
+    ))
 
-def analyze_device_performance(df):
+def analyze_device_performance(df, verbose=True):
     """
     Analyze performance by device type.
     
     Parameters:
-    - df: Input DataFrame
+    - df: Input DataFrame or base cube from _aggregate_base
+    - verbose: Print the summary when True
     
     Returns:
     - DataFrame with device performance summary
     """
     
-    print("\n📱 Device Performance Analysis...")
-    print("=" * 50)
-    
-    # Group by device and calculate metrics
-    device_performance = df.groupby('device').agg({
+    # Group by device and calculate metrics and KPIs
+    device_performance = _add_kpis(df.groupby('device', observed=True, sort=False).agg({
         'impressions': 'sum',
         'clicks': 'sum',
         'conversions': 'sum',
         'cost': 'sum',
         'revenue': 'sum'
-    }).reset_index()
+    }).reset_index())
     
-    # Calculate KPIs
-    device_performance['ctr'] = (device_performance['clicks'] / device_performance['impressions'] * 100).round(2)
-    device_performance['cpc'] = (device_performance['cost'] / device_performance['clicks']).round(2)
-    device_performance['cpa'] = (device_performance['cost'] / device_performance['conversions']).round(2)
-    device_performance['roas'] = (device_performance['revenue'] / device_performance['cost']).round(2)
-    device_performance['conversion_rate'] = (device_performance['conversions'] / device_performance['clicks'] * 100).round(2)
+    if verbose:
+        _print_device_summary(device_performance)
     
-    # Handle division by zero
-    device_performance = device_performance.replace([np.inf, -np.inf], 0)
+    return device_performance
+
+def _print_location_summary(location_performance):
+    """
+    Print the top locations by revenue.
     
-    # Sort by revenue
-    device_performance = device_performance.sort_values('revenue', ascending=False)
+    Parameters:
+    - location_performance: Location performance summary
+    """
     
-    # Print results
-    print("📱 Device Performance Summary:")
-    for _, row in device_performance.iterrows():
-        print(f"\n   {row['device']}")
-        print(f"   Revenue: ${row['revenue']:,.2f} | Cost: ${row['cost']:,.2f} | ROAS: {row['roas']:.2f}x")
-        print(f"   CTR: {row['ctr']:.2f}% | CPC: ${row['cpc']:.2f} | Conversions: {row['conversions']:,}")
+    print("\n📍 Location Performance Analysis...")
+    print("=" * 50)
     
-    return device_performance
+    # Only the top rows need ordering
+    print("🏆 Top 5 Locations by Revenue:")
+    print(location_performance.nlargest(5, 'revenue').to_string(
+        columns=['location'] + _REPORT_COLUMNS,
+        index=False, float_format='{:,.2f}'.format
+    ))
 
-def analyze_location_performance(df):
+def analyze_location_performance(df, verbose=True):
     """
     Analyze performance by location.
     
     Parameters:
-    - df: Input DataFrame
+    - df: Input DataFrame or base cube from _aggregate_base
+    - verbose: Print the summary when True
     
     Returns:
     - DataFrame with location performance summary
     """
     
-    print("\n📍 Location Performance Analysis...")
-    print("=" * 50)
-    
-    # Group by location and calculate metrics
-    location_performance = df.groupby('location').agg({
+    # Group by location and calculate metrics and KPIs
+    location_performance = _add_kpis(df.groupby('location', observed=True, sort=False).agg({
         'impressions': 'sum',
         'clicks': 'sum',
         'conversions': 'sum',
         'cost': 'sum',
         'revenue': 'sum'
-    }).reset_index()
-    
-    # Calculate KPIs
-    location_performance['ctr'] = (location_performance['clicks'] / location_performance['impressions'] * 100).round(2)
-    location_performance['cpc'] = (location_performance['cost'] / location_performance['clicks']).round(2)
-    location_performance['cpa'] = (location_performance['cost'] / location_performance['conversions']).round(2)
-    location_performance['roas'] = (location_performance['revenue'] / location_performance['cost']).round(2)
-    location_performance['conversion_rate'] = (location_performance['conversions'] / location_performance['clicks'] * 100).round(2)
+    }).reset_index())
     
-    # Handle division by zero
-    location_performance = location_performance.replace([np.inf, -np.inf], 0)
-    
-    # Sort by revenue
-    location_performance = location_performance.sort_values('revenue', ascending=False)
-    
-    # Print results
-    print("🏆 Top 5 Locations by Revenue:")
-    for _, row in location_performance.head(5).iterrows():
-        print(f"\n   {row['location']}")
-        print(f"   Revenue: ${row['revenue']:,.2f} | Cost: ${row['cost']:,.2f} | ROAS: {row['roas']:.2f}x")
-        print(f"   CTR: {row['ctr']:.2f}% | CPC: ${row['cpc']:.2f} | Conversions: {row['conversions']:,}")
+    if verbose:
+        _print_location_summary(location_performance)
     
     return location_performance
 
-def analyze_time_trends(df):
+def _summarize_revenue_trend(daily_performance):
     """
-    Analyze performance trends over time.
+    Compare average daily revenue in the first and last week.
     
     Parameters:
-    - df: Input DataFrame
+    - daily_performance: Daily performance trends
     
     Returns:
-    - DataFrame with daily performance trends
+    - Dictionary with first/last week average revenue and the percent change
     """
     
-    print("\n📈 Time Series Trend Analysis...")
-    print("=" * 50)
-    
-    # Group by date and calculate daily metrics
-    daily_performance = df.groupby('date').agg({
-        'impressions': 'sum',
-        'clicks': 'sum',
-        'conversions': 'sum',
-        'cost': 'sum',
-        'revenue': 'sum'
-    }).reset_index()
+    first_week_avg_revenue = daily_performance['revenue'].iloc[:7].mean()
+    last_week_avg_revenue = daily_performance['revenue'].iloc[-7:].mean()
+    revenue_change = ((last_week_avg_revenue - first_week_avg_revenue) / first_week_avg_revenue * 100) if first_week_avg_revenue > 0 else 0
     
-    # Calculate daily KPIs
-    daily_performance['ctr'] = (daily_performance['clicks'] / daily_performance['impressions'] * 100).round(2)
-    daily_performance['cpc'] = (daily_performance['cost'] / daily_performance['clicks']).round(2)
-    daily_performance['roas'] = (daily_performance['revenue'] / daily_performance['cost']).round(2)
+    return {
+        'first_week_avg_revenue': first_week_avg_revenue,
+        'last_week_avg_revenue': last_week_avg_revenue,
+        'revenue_change_pct': revenue_change
+    }
+
+def _print_trend_summary(daily_performance, trend_summary):
+    """
+    Print the week-over-week revenue trend and the best and worst days.
     
-    # Handle division by zero
-    daily_performance = daily_performance.replace([np.inf, -np.inf], 0)
+    Parameters:
+    - daily_performance: Daily performance trends
+    - trend_summary: Dictionary from _summarize_revenue_trend
+    """
     
-    # Calculate moving averages for trend analysis
-    daily_performance['revenue_ma7'] = daily_performance['revenue'].rolling(window=7).mean()
-    daily_performance['ctr_ma7'] = daily_performance['ctr'].rolling(window=7).mean()
-    daily_performance['roas_ma7'] = daily_performance['roas'].rolling(window=7).mean()
+    print("\n📈 Time Series Trend Analysis...")
+    print("=" * 50)
     
-    # Print trend summary
     print("📊 Performance Trends:")
     
     # Compare first and last week
-    first_week = daily_performance.head(7)
-    last_week = daily_performance.tail(7)
-    
-    first_week_avg_revenue = first_week['revenue'].mean()
-    last_week_avg_revenue = last_week['revenue'].mean()
-    revenue_change = ((last_week_avg_revenue - first_week_avg_revenue) / first_week_avg_revenue * 100) if first_week_avg_revenue > 0 else 0
-    
-    print(f"   Revenue Trend: ${first_week_avg_revenue:.2f} → ${last_week_avg_revenue:.2f} ({revenue_change:+.1f}%)")
+    print(f"   Revenue Trend: ${trend_summary['first_week_avg_revenue']:.2f} → ${trend_summary['last_week_avg_revenue']:.2f} ({trend_summary['revenue_change_pct']:+.1f}%)")
     
     # Best and worst performing days
     best_day = daily_performance.loc[daily_performance['revenue'].idxmax()]
@@ -291,72 +417,112 @@ def analyze_time_trends(df):
     
     print(f"   Best Day: {best_day['date'].strftime('%Y-%m-%d')} (${best_day['revenue']:.2f})")
     print(f"   Worst Day: {worst_day['date'].strftime('%Y-%m-%d')} (${worst_day['revenue']:.2f})")
+
+def analyze_time_trends(df, daily=None, verbose=True):
+    """
+    Analyze performance trends over time.
+    
+    Parameters:
+    - df: Input DataFrame or base cube from _aggregate_base
+    - daily: Optional pre-computed daily aggregate from _daily_aggregate
+    - verbose: Print the summary when True
     
-    return daily_performance
+    Returns:
+    - Tuple of (DataFrame with daily performance trends, revenue trend summary dictionary)
+    """
+    
+    # Reuse the shared daily aggregate when provided
+    if daily is None:
+        daily = _daily_aggregate(df)
+    daily_performance = _add_kpis(daily.copy())
+    
+    # Calculate 7-day moving averages for trend analysis from one cumulative
+    # sum over all three series (window sum = cumsum[i] - cumsum[i - 7])
+    window = 7
+    series = daily_performance[['revenue', 'ctr', 'roas']].to_numpy(dtype=float)
+    moving_averages = np.full(series.shape, np.nan)
+    if len(series) >= window:
+        cumsum = np.vstack([np.zeros((1, series.shape[1])), np.cumsum(series, axis=0)])
+        moving_averages[window - 1:] = (cumsum[window:] - cumsum[:-window]) / window
+    daily_performance[['revenue_ma7', 'ctr_ma7', 'roas_ma7']] = moving_averages
+    
+    trend_summary = _summarize_revenue_trend(daily_performance)
+    
+    if verbose:
+        _print_trend_summary(daily_performance, trend_summary)
+    
+    return daily_performance, trend_summary
 
-def detect_anomalies(df, threshold=2.0):
+def detect_anomalies(df, threshold=2.0, daily=None, verbose=True):
     """
     Detect anomalies in performance metrics.
     
     Parameters:
     - df: Input DataFrame
     - threshold: Standard deviation threshold for anomaly detection
+    - daily: Optional pre-computed daily aggregate from _daily_aggregate
+    - verbose: Print the anomalies found when True
     
     Returns:
     - DataFrame with detected anomalies
     """
     
-    print("\n🔍 Anomaly Detection...")
-    print("=" * 50)
-    
-    # Calculate daily performance for anomaly detection
-    daily_metrics = df.groupby('date').agg({
-        'impressions': 'sum',
-        'clicks': 'sum',
-        'conversions': 'sum',
-        'cost': 'sum',
-        'revenue': 'sum'
-    }).reset_index()
+    # Reuse the shared daily aggregate when provided
+    if daily is None:
+        daily = _daily_aggregate(df)
+    daily_metrics = daily.copy()
     
     # Calculate KPIs
-    daily_metrics['ctr'] = (daily_metrics['clicks'] / daily_metrics['impressions'] * 100)
-    daily_metrics['roas'] = (daily_metrics['revenue'] / daily_metrics['cost'])
-    
-    # Handle division by zero
-    daily_metrics = daily_metrics.replace([np.inf, -np.inf], 0)
-    
-    # Detect anomalies using z-score method
-    anomalies = []
-    
-    for metric in ['impressions', 'clicks', 'revenue', 'ctr', 'roas']:
-        if metric in daily_metrics.columns:
-            mean_val = daily_metrics[metric].mean()
-            std_val = daily_metrics[metric].std()
-            
-            if std_val > 0:  # Avoid division by zero
-                z_scores = np.abs((daily_metrics[metric] - mean_val) / std_val)
-                anomaly_dates = daily_metrics[z_scores > threshold]['date']
-                
-                for date in anomaly_dates:
-                    value = daily_metrics[daily_metrics['date'] == date][metric].iloc[0]
-                    anomalies.append({
-                        'date': date,
-                        'metric': metric,
-                        'value': value,
-                        'z_score': z_scores[daily_metrics['date'] == date].iloc[0],
-                        'expected_range': f"{mean_val - threshold*std_val:.2f} - {mean_val + threshold*std_val:.2f}"
-                    })
-    
-    if anomalies:
-        print(f"⚠️ Found {len(anomalies)} anomalies:")
-        for anomaly in anomalies[:5]:  # Show first 5
-            print(f"   {anomaly['date'].strftime('%Y-%m-%d')}: {anomaly['metric']} = {anomaly['value']:.2f} (z-score: {anomaly['z_score']:.2f})")
-    else:
-        print("✅ No significant anomalies detected")
-    
-    return pd.DataFrame(anomalies)
+    daily_metrics['ctr'] = _safe_divide(daily_metrics['clicks'], daily_metrics['impressions']) * 100
+    daily_metrics['roas'] = _safe_divide(daily_metrics['revenue'], daily_metrics['cost'])
+    
+    # Detect anomalies using z-score method across all metrics at once
+    metrics = ['impressions', 'clicks', 'revenue', 'ctr', 'roas']
+    values = daily_metrics[metrics].to_numpy(dtype=float)
+    mean_vals = np.nanmean(values, axis=0)
+    
+    # Take the deviations from the mean once and reuse them: their squares give
+    # the sample standard deviation (np.nanstd would recompute the mean and the
+    # deviations), then the same buffer is scaled in place into the z-scores.
+    # A single day gives a 0 std, and constant metrics get a unit divisor so
+    # their z-scores stay at zero
+    z_scores = np.subtract(values, mean_vals)
+    counts = np.count_nonzero(~np.isnan(values), axis=0)
+    std_vals = np.sqrt(np.nansum(np.square(z_scores), axis=0) / np.maximum(counts - 1, 1))
+    z_scores /= np.where(std_vals > 0, std_vals, 1.0)
+    np.abs(z_scores, out=z_scores)
+    
+    # Transpose so hits come out grouped by metric, then by date
+    metric_idx, date_idx = np.nonzero((z_scores > threshold).T)
+    expected_ranges = np.array([
+        f"{mean_vals[m] - threshold*std_vals[m]:.2f} - {mean_vals[m] + threshold*std_vals[m]:.2f}"
+        for m in range(len(metrics))
+    ])
+    
+    # Build the result column-wise straight from the index arrays
+    anomalies = pd.DataFrame({
+        'date': pd.DatetimeIndex(daily_metrics['date'])[date_idx],
+        'metric': np.array(metrics)[metric_idx],
+        'value': values[date_idx, metric_idx],
+        'z_score': z_scores[date_idx, metric_idx],
+        'expected_range': expected_ranges[metric_idx]
+    })
+    
+    if verbose:
+        print("\n🔍 Anomaly Detection...")
+        print("=" * 50)
+        
+        if not anomalies.empty:
+            print(f"⚠️ Found {len(anomalies)} anomalies:")
+            for anomaly in anomalies.head(5).itertuples():  # Show first 5
+                print(f"   {anomaly.date.strftime('%Y-%m-%d')}: {anomaly.metric} = {anomaly.value:.2f} (z-score: {anomaly.z_score:.2f})")
+        else:
+            print("✅ No significant anomalies detected")
+    
+    return anomalies
 
-def generate_insights(df, campaign_performance, device_performance, location_performance, daily_performance):
+def generate_insights(df, campaign_performance, device_performance, location_performance, daily_performance,
+                      trend_summary=None, verbose=True):
     """
     Generate actionable insights from the analysis.
     
@@ -366,14 +532,13 @@ def generate_insights(df, campaign_performance, device_performance, location_per
     - device_performance: Device performance summary
     - location_performance: Location performance summary
     - daily_performance: Daily performance trends
+    - trend_summary: Optional revenue trend summary returned by analyze_time_trends
+    - verbose: Print the insights when True
     
     Returns:
     - Dictionary with insights and recommendations
     """
     
-    print("\n💡 Generating Insights and Recommendations...")
-    print("=" * 50)
-    
     insights = {
         'top_performers': [],
         'optimization_opportunities': [],
@@ -382,105 +547,131 @@ def generate_insights(df, campaign_performance, device_performance, location_per
     }
     
     # 1. Top Performers
-    print("🏆 Top Performers:")
     
     # Best campaign
     best_campaign = campaign_performance.loc[campaign_performance['roas'].idxmax()]
     insights['top_performers'].append(f"Best ROAS Campaign: {best_campaign['campaign_name']} ({best_campaign['roas']:.2f}x)")
-    print(f"   Best ROAS: {best_campaign['campaign_name']} ({best_campaign['roas']:.2f}x)")
     
     # Best device
     best_device = device_performance.loc[device_performance['roas'].idxmax()]
     insights['top_performers'].append(f"Best Device: {best_device['device']} (ROAS: {best_device['roas']:.2f}x)")
-    print(f"   Best Device: {best_device['device']} (ROAS: {best_device['roas']:.2f}x)")
     
     # Best location
     best_location = location_performance.loc[location_performance['roas'].idxmax()]
     insights['top_performers'].append(f"Best Location: {best_location['location']} (ROAS: {best_location['roas']:.2f}x)")
-    print(f"   Best Location: {best_location['location']} (ROAS: {best_location['roas']:.2f}x)")
     
     # 2. Optimization Opportunities
-    print("\n🎯 Optimization Opportunities:")
     
     # Worst performing campaign
     worst_campaign = campaign_performance.loc[campaign_performance['roas'].idxmin()]
     if worst_campaign['roas'] < 1.0:
         insights['optimization_opportunities'].append(f"Consider pausing {worst_campaign['campaign_name']} (ROAS: {worst_campaign['roas']:.2f}x)")
-        print(f"   Consider pausing: {worst_campaign['campaign_name']} (ROAS: {worst_campaign['roas']:.2f}x)")
     
     # High CPC campaigns
-    high_cpc_campaigns = campaign_performance[campaign_performance['cpc'] > campaign_performance['cpc'].mean() * 1.5]
-    for _, campaign in high_cpc_campaigns.iterrows():
-        insights['optimization_opportunities'].append(f"Optimize bids for {campaign['campaign_name']} (CPC: ${campaign['cpc']:.2f})")
-        print(f"   Optimize bids: {campaign['campaign_name']} (CPC: ${campaign['cpc']:.2f})")
+    high_cpc_threshold = campaign_performance['cpc'].mean() * 1.5
+    high_cpc_campaigns = campaign_performance[campaign_performance['cpc'] > high_cpc_threshold]
+    insights['optimization_opportunities'].extend(
+        f"Optimize bids for {name} (CPC: ${cpc:.2f})"
+        for name, cpc in zip(high_cpc_campaigns['campaign_name'], high_cpc_campaigns['cpc'])
+    )
     
     # 3. Trends
-    print("\n📈 Key Trends:")
     
-    # Revenue trend
-    first_week_revenue = daily_performance.head(7)['revenue'].mean()
-    last_week_revenue = daily_performance.tail(7)['revenue'].mean()
-    revenue_trend = "increasing" if last_week_revenue > first_week_revenue else "decreasing"
+    # Revenue trend (reuse the week averages from analyze_time_trends)
+    if trend_summary is None:
+        trend_summary = _summarize_revenue_trend(daily_performance)
+    revenue_trend = "increasing" if trend_summary['last_week_avg_revenue'] > trend_summary['first_week_avg_revenue'] else "decreasing"
     insights['trends'].append(f"Revenue trend is {revenue_trend}")
-    print(f"   Revenue trend is {revenue_trend}")
     
     # Device trend
     mobile_performance = device_performance[device_performance['device'] == 'Mobile']
     if not mobile_performance.empty:
         mobile_roas = mobile_performance.iloc[0]['roas']
         insights['trends'].append(f"Mobile ROAS: {mobile_roas:.2f}x")
-        print(f"   Mobile ROAS: {mobile_roas:.2f}x")
     
     # 4. Recommendations
-    print("\n💡 Recommendations:")
     
     # Budget reallocation
-    total_cost = campaign_performance['cost'].sum()
     high_roas_campaigns = campaign_performance[campaign_performance['roas'] > 1.5]
     if not high_roas_campaigns.empty:
         insights['recommendations'].append("Increase budget allocation to high-ROAS campaigns")
-        print("   Increase budget allocation to high-ROAS campaigns")
     
     # Device optimization
     if device_performance['roas'].max() > device_performance['roas'].min() * 1.5:
         insights['recommendations'].append("Optimize device targeting based on performance")
-        print("   Optimize device targeting based on performance")
     
     # Location expansion
-    top_locations = location_performance.head(3)
+    top_locations = location_performance.nlargest(3, 'revenue')
     insights['recommendations'].append(f"Consider expanding to top-performing locations: {', '.join(top_locations['location'].tolist())}")
-    print(f"   Consider expanding to top-performing locations: {', '.join(top_locations['location'].tolist())}")
+    
+    if verbose:
+        print("\n💡 Generating Insights and Recommendations...")
+        print("=" * 50)
+        
+        sections = [
+            ("🏆 Top Performers:", 'top_performers'),
+            ("\n🎯 Optimization Opportunities:", 'optimization_opportunities'),
+            ("\n📈 Key Trends:", 'trends'),
+            ("\n💡 Recommendations:", 'recommendations')
+        ]
+        for heading, key in sections:
+            print(heading)
+            for item in insights[key]:
+                print(f"   {item}")
     
     return insights
 
+def _write_table(table, name, fmt='parquet'):
+    """
+    Write one result table to the data directory.
+    
+    Parameters:
+    - table: DataFrame to save
+    - name: File name without extension
+    - fmt: 'parquet' (Snappy-compressed, columnar) or 'csv'
+    
+    Returns:
+    - Path of the written file
+    """
+    
+    filepath = os.path.join('data', f'{name}.{fmt}')
+    if fmt == 'parquet':
+        table.to_parquet(filepath, compression='snappy', index=False)
+    elif fmt == 'csv':
+        table.to_csv(filepath, index=False)
+    else:
+        raise ValueError(f"Unsupported output format: {fmt}")
+    
+    return filepath
+
 def save_analysis_results(campaign_performance, device_performance, location_performance, 
-                         daily_performance, insights, filename='analysis_results.csv'):
+                         daily_performance, insights, filename='analysis_results.csv', fmt='parquet'):
     """
-    Save analysis results to CSV files.
+    Save analysis results to Parquet (default) or CSV files.
     
     Parameters:
     - Various performance DataFrames and insights
     - filename: Base filename for saving results
+    - fmt: Output format, 'parquet' or 'csv'
     """
     
     # Ensure data directory exists
     os.makedirs('data', exist_ok=True)
     
-    # Save campaign performance
-    campaign_file = os.path.join('data', 'campaign_performance.csv')
-    campaign_performance.to_csv(campaign_file, index=False)
+    # Save campaign performance (segment tables are sorted by revenue on save)
+    campaign_file = _write_table(campaign_performance.sort_values('revenue', ascending=False),
+                                 'campaign_performance', fmt)
     
     # Save device performance
-    device_file = os.path.join('data', 'device_performance.csv')
-    device_performance.to_csv(device_file, index=False)
+    device_file = _write_table(device_performance.sort_values('revenue', ascending=False),
+                               'device_performance', fmt)
     
     # Save location performance
-    location_file = os.path.join('data', 'location_performance.csv')
-    location_performance.to_csv(location_file, index=False)
+    location_file = _write_table(location_performance.sort_values('revenue', ascending=False),
+                                 'location_performance', fmt)
     
     # Save daily trends
-    daily_file = os.path.join('data', 'daily_trends.csv')
-    daily_performance.to_csv(daily_file, index=False)
+    daily_file = _write_table(daily_performance, 'daily_trends', fmt)
     
     print(f"\n💾 Analysis results saved:")
     print(f"   - {campaign_file}")
@@ -501,15 +692,38 @@ if __name__ == "__main__":
     if df is None:
         exit(1)
     
+    # Scan the raw rows once; the overall KPIs and every segment summary
+    # roll up from this cube. Set ANALYSIS_BACKEND=cudf to run it on a GPU
+    base = _aggregate_base(df, backend=os.environ.get('ANALYSIS_BACKEND', 'pandas'))
+    daily = _daily_aggregate(base)
+    
     # Perform comprehensive analysis
-    overall_kpis = calculate_overall_kpis(df)
-    campaign_performance = analyze_campaign_performance(df)
-    device_performance = analyze_device_performance(df)
-    location_performance = analyze_location_performance(df)
-    daily_performance = analyze_time_trends(df)
-    anomalies = detect_anomalies(df)
+    overall_kpis = calculate_overall_kpis(base)
+    
+    # The segment analyses are independent, so run them concurrently and
+    # print their reports in a fixed order once all of them have finished
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            'campaign': executor.submit(analyze_campaign_performance, base, verbose=False),
+            'device': executor.submit(analyze_device_performance, base, verbose=False),
+            'location': executor.submit(analyze_location_performance, base, verbose=False),
+            'daily': executor.submit(analyze_time_trends, base, daily=daily, verbose=False)
+        }
+        results = {name: future.result() for name, future in futures.items()}
+    
+    campaign_performance = results['campaign']
+    device_performance = results['device']
+    location_performance = results['location']
+    daily_performance, trend_summary = results['daily']
+    
+    _print_campaign_summary(campaign_performance)
+    _print_device_summary(device_performance)
+    _print_location_summary(location_performance)
+    _print_trend_summary(daily_performance, trend_summary)
+    
+    anomalies = detect_anomalies(base, daily=daily)
     insights = generate_insights(df, campaign_performance, device_performance, 
-                               location_performance, daily_performance)
+                               location_performance, daily_performance, trend_summary)
     
     # Save results
     save_analysis_results(campaign_performance, device_performance, location_performance,
@@ -16,9 +16,9 @@ Key Features:
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
+# plotly.express and plotly.subplots are slow to import, so the chart
+# functions that need them import them on first use
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import os
 from datetime import datetime, timedelta
 import warnings
@@ -79,6 +79,65 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Campaign columns read from the processed data (the engineered feature
+# columns added by data_processing.py are not used by the dashboard)
+MAIN_COLUMNS = ['date', 'campaign_id', 'campaign_name', 'campaign_type', 'keyword',
+                'device', 'location', 'impressions', 'clicks', 'conversions', 'cost',
+                'revenue', 'ctr', 'cpc', 'cpa', 'roas', 'conversion_rate']
+
+# Low-cardinality dimensions are loaded as categoricals so unique() and
+# isin() work on the categories instead of every row; money and ratio columns
+# fit in float32 (counts stay inferred, capping can leave fractional values)
+MAIN_DTYPES = {
+    **{col: 'category' for col in ('campaign_id', 'campaign_name', 'campaign_type',
+                                   'keyword', 'device', 'location')},
+    **{col: 'float32' for col in ('cost', 'revenue', 'ctr', 'cpc', 'cpa', 'roas', 'conversion_rate')}
+}
+
+# The analysis tables get the same treatment for their dimension columns
+ANALYSIS_DTYPES = {
+    'campaign_performance': dict.fromkeys(('campaign_id', 'campaign_name', 'campaign_type'), 'category'),
+    'device_performance': {'device': 'category'},
+    'location_performance': {'location': 'category'}
+}
+
+def read_main_data():
+    """
+    Read the processed campaign data, preferring Parquet over CSV.
+    
+    Only the needed columns are read, typed in the same pass (dates parsed,
+    dimensions as categoricals). Both formats are decoded by Arrow but land in
+    NumPy-backed columns, which sum and group faster here than Arrow-backed dtypes.
+    
+    Returns:
+    - DataFrame with the processed campaign data
+    """
+    parquet_path = os.path.join('data', 'campaign_data_processed.parquet')
+    if os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path, engine='pyarrow', columns=MAIN_COLUMNS).astype(MAIN_DTYPES)
+    return pd.read_csv(os.path.join('data', 'campaign_data_processed.csv'), engine='pyarrow',
+                       usecols=MAIN_COLUMNS, dtype=MAIN_DTYPES, parse_dates=['date'])
+
+def read_analysis_table(name, parse_dates=None):
+    """
+    Read one analysis result table, preferring Parquet over CSV.
+    
+    Parameters:
+    - name: Table name without extension (e.g. 'campaign_performance')
+    - parse_dates: Date columns to parse when falling back to CSV
+      (Parquet already stores them as datetimes)
+    
+    Dimension columns are typed from ANALYSIS_DTYPES in both formats.
+    
+    Returns:
+    - DataFrame with the table contents
+    """
+    dtypes = ANALYSIS_DTYPES.get(name, {})
+    parquet_path = os.path.join('data', f'{name}.parquet')
+    if os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path).astype(dtypes)
+    return pd.read_csv(os.path.join('data', f'{name}.csv'), dtype=dtypes, parse_dates=parse_dates)
+
 @st.cache_data
 def load_data():
     """
@@ -91,30 +150,47 @@ def load_data():
     
     # Load main processed data
     try:
-        data['main'] = pd.read_csv('data/campaign_data_processed.csv')
-        data['main']['date'] = pd.to_datetime(data['main']['date'])
+        data['main'] = read_main_data()
     except FileNotFoundError:
         # If processed data not found, generate it automatically
         st.info("🔄 Generating sample data for demonstration...")
         generate_sample_data()
-        data['main'] = pd.read_csv('data/campaign_data_processed.csv')
-        data['main']['date'] = pd.to_datetime(data['main']['date'])
+        data['main'] = read_main_data()
+    
+    # Keep rows in date order so date ranges can be binary-searched
+    main_df = data['main'] = data['main'].sort_values('date', kind='stable', ignore_index=True)
+    
+    # Filter options and summary values, computed once instead of per rerun
+    data['meta'] = {
+        # Changes on every fresh load, so caches keyed on it drop old results
+        'loaded_at': datetime.now(),
+        'campaigns': tuple(main_df['campaign_name'].unique()),
+        'devices': tuple(main_df['device'].unique()),
+        'date_min': main_df['date'].min(),
+        'date_max': main_df['date'].max(),
+        'n_campaigns': main_df['campaign_id'].nunique(),
+        'n_devices': main_df['device'].nunique(),
+        'n_locations': main_df['location'].nunique()
+    }
+    
+    # Aggregate the main data per day once so charts reuse it on every rerun
+    data['main_daily'] = data['main'].groupby('date', as_index=False)[
+        ['revenue', 'cost', 'impressions', 'clicks', 'conversions']
+    ].sum()
     
     # Load analysis results
     try:
-        data['campaign_performance'] = pd.read_csv('data/campaign_performance.csv')
-        data['device_performance'] = pd.read_csv('data/device_performance.csv')
-        data['location_performance'] = pd.read_csv('data/location_performance.csv')
-        data['daily_trends'] = pd.read_csv('data/daily_trends.csv')
-        data['daily_trends']['date'] = pd.to_datetime(data['daily_trends']['date'])
+        data['campaign_performance'] = read_analysis_table('campaign_performance')
+        data['device_performance'] = read_analysis_table('device_performance')
+        data['location_performance'] = read_analysis_table('location_performance')
+        data['daily_trends'] = read_analysis_table('daily_trends', parse_dates=['date'])
     except FileNotFoundError:
         st.warning("⚠️ Analysis results not found. Generating sample analysis...")
         generate_sample_analysis()
-        data['campaign_performance'] = pd.read_csv('data/campaign_performance.csv')
-        data['device_performance'] = pd.read_csv('data/device_performance.csv')
-        data['location_performance'] = pd.read_csv('data/location_performance.csv')
-        data['daily_trends'] = pd.read_csv('data/daily_trends.csv')
-        data['daily_trends']['date'] = pd.to_datetime(data['daily_trends']['date'])
+        data['campaign_performance'] = read_analysis_table('campaign_performance')
+        data['device_performance'] = read_analysis_table('device_performance')
+        data['location_performance'] = read_analysis_table('location_performance')
+        data['daily_trends'] = read_analysis_table('daily_trends', parse_dates=['date'])
     
     return data
 
@@ -272,21 +348,20 @@ def create_minimal_sample_analysis():
     })
     daily_data.to_csv('data/daily_trends.csv', index=False)
 
-def calculate_kpis(df):
+def _compute_kpis(df):
     """
-    Calculate overall KPIs from the data.
+    Sum the base metrics and derive the KPIs (uncached; see the wrappers below).
     
     Parameters:
-    - df: Main dataframe
+    - df: Dataframe to summarise
     
     Returns:
     - Dictionary with KPI values
     """
-    total_impressions = df['impressions'].sum()
-    total_clicks = df['clicks'].sum()
-    total_conversions = df['conversions'].sum()
-    total_cost = df['cost'].sum()
-    total_revenue = df['revenue'].sum()
+    # Sum the base metrics in a single reduction, accumulating in float64
+    # so the float32 money columns keep full precision at the totals
+    totals = df[['impressions', 'clicks', 'conversions', 'cost', 'revenue']].to_numpy(dtype=np.float64).sum(axis=0)
+    total_impressions, total_clicks, total_conversions, total_cost, total_revenue = totals
     
     ctr = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0
     cpc = (total_cost / total_clicks) if total_clicks > 0 else 0
@@ -307,6 +382,49 @@ def calculate_kpis(df):
         'conversion_rate': conversion_rate
     }
 
+@st.cache_data
+def calculate_kpis(df):
+    """
+    Calculate overall KPIs from the data.
+    
+    Parameters:
+    - df: Main dataframe
+    
+    Returns:
+    - Dictionary with KPI values
+    """
+    return _compute_kpis(df)
+
+@st.cache_data
+def _filtered_kpis(_filtered_df, selection):
+    """
+    Calculate KPIs for a filtered view, cached on the filter selection.
+    
+    Parameters:
+    - _filtered_df: Filtered dataframe (not hashed by Streamlit)
+    - selection: Hashable tuple of the data load time and the filter values
+      that produced it
+    
+    Returns:
+    - Dictionary with KPI values
+    """
+    # Call the uncached helper: going through calculate_kpis would make
+    # Streamlit hash the whole filtered frame that this cache skips
+    return _compute_kpis(_filtered_df)
+
+def show_table(df, key, max_rows=50):
+    """
+    Display a dataframe, capped to its first rows unless the user expands it.
+    
+    Parameters:
+    - df: Dataframe to display
+    - key: Unique widget key for the "Show all" checkbox
+    - max_rows: Number of rows shown by default
+    """
+    if len(df) > max_rows and not st.checkbox(f"Show all {len(df):,} rows", key=key):
+        df = df.head(max_rows)
+    st.dataframe(df)
+
 def create_kpi_cards(kpis):
     """
     Create KPI metric cards for the dashboard.
@@ -356,21 +474,16 @@ def create_kpi_cards(kpis):
         </div>
         """, unsafe_allow_html=True)
 
-def create_revenue_cost_chart(df):
+def create_revenue_cost_chart(daily_data):
     """
     Create revenue vs cost chart.
     
     Parameters:
-    - df: Main dataframe
+    - daily_data: Daily aggregate of the main dataframe (data['main_daily'])
     """
-    daily_data = df.groupby('date').agg({
-        'revenue': 'sum',
-        'cost': 'sum'
-    }).reset_index()
-    
     fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=daily_data['date'],
         y=daily_data['revenue'],
         mode='lines+markers',
@@ -379,7 +492,7 @@ def create_revenue_cost_chart(df):
         marker=dict(size=6)
     ))
     
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=daily_data['date'],
         y=daily_data['cost'],
         mode='lines+markers',
@@ -405,6 +518,8 @@ def create_campaign_performance_chart(campaign_data):
     Parameters:
     - campaign_data: Campaign performance dataframe
     """
+    import plotly.express as px
+    
     fig = px.bar(
         campaign_data,
         x='campaign_name',
@@ -429,6 +544,8 @@ def create_device_performance_chart(device_data):
     Parameters:
     - device_data: Device performance dataframe
     """
+    import plotly.express as px
+    
     fig = px.pie(
         device_data,
         values='revenue',
@@ -447,6 +564,8 @@ def create_location_heatmap(location_data):
     Parameters:
     - location_data: Location performance dataframe
     """
+    import plotly.express as px
+    
     # Create a heatmap of ROAS by location
     fig = px.bar(
         location_data.sort_values('roas', ascending=True),
@@ -473,6 +592,8 @@ def create_trend_analysis(daily_data):
     Parameters:
     - daily_data: Daily trends dataframe
     """
+    from plotly.subplots import make_subplots
+    
     # Create subplots for different metrics
     fig = make_subplots(
         rows=2, cols=2,
@@ -483,38 +604,39 @@ def create_trend_analysis(daily_data):
     
     # CTR Trend
     fig.add_trace(
-        go.Scatter(x=daily_data['date'], y=daily_data['ctr'], name='CTR', line=dict(color='#1f77b4')),
+        go.Scattergl(x=daily_data['date'], y=daily_data['ctr'], name='CTR', line=dict(color='#1f77b4')),
         row=1, col=1
     )
     
     # ROAS Trend
     fig.add_trace(
-        go.Scatter(x=daily_data['date'], y=daily_data['roas'], name='ROAS', line=dict(color='#2ca02c')),
+        go.Scattergl(x=daily_data['date'], y=daily_data['roas'], name='ROAS', line=dict(color='#2ca02c')),
         row=1, col=2
     )
     
     # CPC Trend
     fig.add_trace(
-        go.Scatter(x=daily_data['date'], y=daily_data['cpc'], name='CPC', line=dict(color='#d62728')),
+        go.Scattergl(x=daily_data['date'], y=daily_data['cpc'], name='CPC', line=dict(color='#d62728')),
         row=2, col=1
     )
     
     # Conversion Rate Trend
     conversion_rate = (daily_data['conversions'] / daily_data['clicks'] * 100).fillna(0)
     fig.add_trace(
-        go.Scatter(x=daily_data['date'], y=conversion_rate, name='Conv Rate', line=dict(color='#ff7f0e')),
+        go.Scattergl(x=daily_data['date'], y=conversion_rate, name='Conv Rate', line=dict(color='#ff7f0e')),
         row=2, col=2
     )
     
     fig.update_layout(height=600, showlegend=False)
     st.plotly_chart(fig, use_container_width=True)
 
-def create_filtered_analysis(df):
+def create_filtered_analysis(df, meta):
     """
     Create filtered analysis based on user selections.
     
     Parameters:
     - df: Main dataframe
+    - meta: Precomputed filter options and date bounds (data['meta'])
     """
     st.subheader("🔍 Filtered Analysis")
     
@@ -524,36 +646,39 @@ def create_filtered_analysis(df):
     with col1:
         selected_campaigns = st.multiselect(
             "Select Campaigns",
-            options=df['campaign_name'].unique(),
-            default=df['campaign_name'].unique()[:3]
+            options=meta['campaigns'],
+            default=meta['campaigns'][:3]
         )
     
     with col2:
         selected_devices = st.multiselect(
             "Select Devices",
-            options=df['device'].unique(),
-            default=df['device'].unique()
+            options=meta['devices'],
+            default=meta['devices']
         )
     
     with col3:
         date_range = st.date_input(
             "Select Date Range",
-            value=(df['date'].min(), df['date'].max()),
-            min_value=df['date'].min(),
-            max_value=df['date'].max()
+            value=(meta['date_min'], meta['date_max']),
+            min_value=meta['date_min'],
+            max_value=meta['date_max']
         )
     
-    # Apply filters
-    filtered_df = df[
-        (df['campaign_name'].isin(selected_campaigns)) &
-        (df['device'].isin(selected_devices)) &
-        (df['date'] >= pd.to_datetime(date_range[0])) &
-        (df['date'] <= pd.to_datetime(date_range[1]))
+    # Apply filters: rows are in date order (see load_data), so the date
+    # range is a binary-searched slice and only the slice is masked
+    start = df['date'].searchsorted(pd.to_datetime(date_range[0]), side='left')
+    end = df['date'].searchsorted(pd.to_datetime(date_range[1]), side='right')
+    date_slice = df.iloc[start:end]
+    filtered_df = date_slice[
+        date_slice['campaign_name'].isin(selected_campaigns) &
+        date_slice['device'].isin(selected_devices)
     ]
     
     if not filtered_df.empty:
         # Calculate filtered KPIs
-        filtered_kpis = calculate_kpis(filtered_df)
+        selection = (meta['loaded_at'], tuple(selected_campaigns), tuple(selected_devices), tuple(date_range))
+        filtered_kpis = _filtered_kpis(filtered_df, selection)
         
         st.write("**Filtered Performance Summary:**")
         col1, col2, col3, col4 = st.columns(4)
@@ -568,10 +693,33 @@ def create_filtered_analysis(df):
             st.metric("CTR", f"{filtered_kpis['ctr']:.2f}%")
         
         # Show filtered data
-        st.dataframe(filtered_df.head(10))
+        st.dataframe(filtered_df.head(10), use_container_width=True, height=300)
     else:
         st.warning("No data matches the selected filters.")
 
+@st.cache_data
+def _compute_insights(campaign_data, location_data):
+    """
+    Pick the campaigns and location highlighted in the insights section.
+    
+    Parameters:
+    - campaign_data: Campaign performance dataframe, or None
+    - location_data: Location performance dataframe, or None
+    
+    Returns:
+    - Dictionary with the best/worst campaign and best location rows as dicts
+    """
+    insights = {}
+    
+    if campaign_data is not None:
+        insights['best_campaign'] = campaign_data.loc[campaign_data['roas'].idxmax()].to_dict()
+        insights['worst_campaign'] = campaign_data.loc[campaign_data['roas'].idxmin()].to_dict()
+    
+    if location_data is not None:
+        insights['best_location'] = location_data.loc[location_data['roas'].idxmax()].to_dict()
+    
+    return insights
+
 def create_insights_section(data):
     """
     Create insights and recommendations section.
@@ -581,12 +729,11 @@ def create_insights_section(data):
     """
     st.subheader("💡 Insights & Recommendations")
     
-    if 'campaign_performance' in data:
-        campaign_data = data['campaign_performance']
-        
-        # Top performers
-        best_campaign = campaign_data.loc[campaign_data['roas'].idxmax()]
-        worst_campaign = campaign_data.loc[campaign_data['roas'].idxmin()]
+    insights = _compute_insights(data.get('campaign_performance'), data.get('location_performance'))
+    
+    if 'best_campaign' in insights:
+        best_campaign = insights['best_campaign']
+        worst_campaign = insights['worst_campaign']
         
         col1, col2 = st.columns(2)
         
@@ -609,9 +756,8 @@ def create_insights_section(data):
                 </div>
                 """, unsafe_allow_html=True)
     
-    if 'location_performance' in data:
-        location_data = data['location_performance']
-        best_location = location_data.loc[location_data['roas'].idxmax()]
+    if 'best_location' in insights:
+        best_location = insights['best_location']
         
         st.markdown(f"""
         <div class="insight-box">
@@ -652,7 +798,7 @@ def main():
         
         # Revenue vs Cost chart
         st.subheader("💰 Revenue vs Cost Trend")
-        create_revenue_cost_chart(data['main'])
+        create_revenue_cost_chart(data['main_daily'])
         
         # Insights
         create_insights_section(data)
@@ -665,7 +811,7 @@ def main():
             
             # Campaign performance table
             st.subheader("📋 Campaign Performance Details")
-            st.dataframe(data['campaign_performance'])
+            show_table(data['campaign_performance'], key='campaign_show_all')
         else:
             st.warning("Campaign performance data not available. Please run analysis.py first.")
     
@@ -680,7 +826,7 @@ def main():
             
             with col2:
                 st.subheader("📊 Device Performance Summary")
-                st.dataframe(data['device_performance'])
+                show_table(data['device_performance'], key='device_show_all')
         else:
             st.warning("Device performance data not available. Please run analysis.py first.")
     
@@ -691,7 +837,7 @@ def main():
             create_location_heatmap(data['location_performance'])
             
             st.subheader("📋 Location Performance Details")
-            st.dataframe(data['location_performance'])
+            show_table(data['location_performance'], key='location_show_all')
         else:
             st.warning("Location performance data not available. Please run analysis.py first.")
     
@@ -705,15 +851,16 @@ def main():
     
     elif page == "🔍 Filtered Analysis":
         st.header("🔍 Custom Analysis")
-        create_filtered_analysis(data['main'])
+        create_filtered_analysis(data['main'], data['meta'])
     
     # Footer
     st.sidebar.markdown("---")
     st.sidebar.markdown("**Data Summary:**")
-    st.sidebar.markdown(f"📅 Date Range: {data['main']['date'].min().strftime('%Y-%m-%d')} to {data['main']['date'].max().strftime('%Y-%m-%d')}")
-    st.sidebar.markdown(f"🎯 Campaigns: {data['main']['campaign_id'].nunique()}")
-    st.sidebar.markdown(f"📱 Devices: {data['main']['device'].nunique()}")
-    st.sidebar.markdown(f"📍 Locations: {data['main']['location'].nunique()}")
+    meta = data['meta']
+    st.sidebar.markdown(f"📅 Date Range: {meta['date_min'].strftime('%Y-%m-%d')} to {meta['date_max'].strftime('%Y-%m-%d')}")
+    st.sidebar.markdown(f"🎯 Campaigns: {meta['n_campaigns']}")
+    st.sidebar.markdown(f"📱 Devices: {meta['n_devices']}")
+    st.sidebar.markdown(f"📍 Locations: {meta['n_locations']}")
     st.sidebar.markdown(f"📊 Total Records: {len(data['main']):,}")
 
 if __name__ == "__main__":
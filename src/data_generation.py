@@ -16,201 +16,236 @@ Key Concepts You'll Learn:
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import random
 import os
 
-# Set random seed for reproducibility
-np.random.seed(42)
-random.seed(42)
+# Seeded PCG64 generator shared by all draws, for reproducibility
+rng = np.random.default_rng(42)
 
-def generate_campaign_data(start_date='2024-01-01', days=90):
+# Campaign configurations, one entry per campaign
+_CAMPAIGN_IDS = np.array(['CAMP_001', 'CAMP_002', 'CAMP_003', 'CAMP_004', 'CAMP_005'])
+_CAMPAIGN_NAMES = np.array(['Summer Sale 2024', 'Brand Awareness', 'Product Launch', 'Retargeting', 'Holiday Special'])
+_CAMPAIGN_TYPES = np.array(['Search', 'Display', 'Search', 'Display', 'Search'])
+
+# Keywords for search campaigns
+_KEYWORDS = np.array([
+    'summer sale', 'discount', 'clearance', 'brand name', 'product category',
+    'best price', 'free shipping', 'limited time', 'exclusive offer', 'new arrival'
+])
+
+# Devices and locations
+_DEVICES = np.array(['Desktop', 'Mobile', 'Tablet'])
+_LOCATIONS = np.array(['New York', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix',
+                       'Philadelphia', 'San Antonio', 'San Diego', 'Dallas', 'San Jose'])
+
+def _safe_divide(numerator, denominator):
+    """
+    Divide two columns element-wise without materializing infinities.
+    
+    Parameters:
+    - numerator: Series or array of numerators
+    - denominator: Series or array of denominators
+    
+    Returns:
+    - NumPy array with the ratio, or 0 where the denominator is not positive
+    """
+    
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
+
+def generate_campaign_data(start_date='2024-01-01', days=90, verbose=True):
     """
     Generate synthetic ad campaign data for the specified date range.
     
     Parameters:
     - start_date: Start date for the data
     - days: Number of days to generate data for
+    - verbose: Print progress messages when True
     
     Returns:
     - DataFrame with campaign performance data
     """
     
-    print("🎯 Generating synthetic ad campaign data...")
-    print(f"📅 Date range: {start_date} to {start_date} + {days} days")
+    if verbose:
+        print("🎯 Generating synthetic ad campaign data...")
+        print(f"📅 Date range: {start_date} to {start_date} + {days} days")
     
     # Create date range
     date_range = pd.date_range(start=start_date, periods=days, freq='D')
     
-    # Define campaign configurations
-    campaigns = [
-        {'id': 'CAMP_001', 'name': 'Summer Sale 2024', 'budget': 5000, 'type': 'Search'},
-        {'id': 'CAMP_002', 'name': 'Brand Awareness', 'budget': 3000, 'type': 'Display'},
-        {'id': 'CAMP_003', 'name': 'Product Launch', 'budget': 8000, 'type': 'Search'},
-        {'id': 'CAMP_004', 'name': 'Retargeting', 'budget': 2000, 'type': 'Display'},
-        {'id': 'CAMP_005', 'name': 'Holiday Special', 'budget': 6000, 'type': 'Search'}
-    ]
-    
-    # Define keywords for search campaigns
-    keywords = [
-        'summer sale', 'discount', 'clearance', 'brand name', 'product category',
-        'best price', 'free shipping', 'limited time', 'exclusive offer', 'new arrival'
-    ]
-    
-    # Define devices and locations
-    devices = ['Desktop', 'Mobile', 'Tablet']
-    locations = ['New York', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix', 
-                'Philadelphia', 'San Antonio', 'San Diego', 'Dallas', 'San Jose']
-    
-    # Initialize empty lists to store data
-    data = []
-    
-    # Generate data for each date
-    for date in date_range:
-        # Add some weekend/weekday variation
-        is_weekend = date.weekday() >= 5
-        
-        for campaign in campaigns:
-            # Generate multiple records per campaign per day (different keywords/devices)
-            num_records = np.random.randint(3, 8) if not is_weekend else np.random.randint(1, 4)
-            
-            for _ in range(num_records):
-                # Base metrics with realistic relationships
-                impressions = np.random.poisson(1000 if not is_weekend else 600)
-                
-                # CTR varies by campaign type and device
-                base_ctr = 0.02 if campaign['type'] == 'Search' else 0.005
-                ctr_variation = np.random.normal(0, 0.005)
-                ctr = max(0.001, min(0.1, base_ctr + ctr_variation))
-                
-                clicks = int(impressions * ctr)
-                
-                # Conversion rate depends on campaign type and CTR
-                base_cvr = 0.05 if campaign['type'] == 'Search' else 0.02
-                cvr_variation = np.random.normal(0, 0.01)
-                conversion_rate = max(0.001, min(0.2, base_cvr + cvr_variation))
-                
-                conversions = int(clicks * conversion_rate)
-                
-                # Cost per click varies by competition and quality
-                base_cpc = 2.5 if campaign['type'] == 'Search' else 0.8
-                cpc_variation = np.random.normal(0, 0.5)
-                cpc = max(0.1, base_cpc + cpc_variation)
-                
-                cost = clicks * cpc
-                
-                # Revenue per conversion (simplified)
-                base_revenue = 50 if campaign['type'] == 'Search' else 30
-                revenue_variation = np.random.normal(0, 10)
-                revenue_per_conversion = max(5, base_revenue + revenue_variation)
-                
-                revenue = conversions * revenue_per_conversion
-                
-                # Select random attributes
-                device = np.random.choice(devices, p=[0.4, 0.5, 0.1])  # Mobile is most common
-                location = np.random.choice(locations)
-                keyword = np.random.choice(keywords) if campaign['type'] == 'Search' else 'display_ad'
-                
-                # Create record
-                record = {
-                    'date': date,
-                    'campaign_id': campaign['id'],
-                    'campaign_name': campaign['name'],
-                    'campaign_type': campaign['type'],
-                    'keyword': keyword,
-                    'device': device,
-                    'location': location,
-                    'impressions': impressions,
-                    'clicks': clicks,
-                    'conversions': conversions,
-                    'cost': round(cost, 2),
-                    'revenue': round(revenue, 2)
-                }
-                
-                data.append(record)
-    
-    # Convert to DataFrame
-    df = pd.DataFrame(data)
-    
-    # Add derived metrics
-    df['ctr'] = (df['clicks'] / df['impressions'] * 100).round(2)
-    df['cpc'] = (df['cost'] / df['clicks']).round(2)
-    df['cpa'] = (df['cost'] / df['conversions']).round(2)
-    df['roas'] = (df['revenue'] / df['cost']).round(2)
-    df['conversion_rate'] = (df['conversions'] / df['clicks'] * 100).round(2)
-    
-    # Handle division by zero
-    df['cpc'] = df['cpc'].replace([np.inf, -np.inf], 0)
-    df['cpa'] = df['cpa'].replace([np.inf, -np.inf], 0)
-    df['roas'] = df['roas'].replace([np.inf, -np.inf], 0)
-    
-    print(f"✅ Generated {len(df)} records across {len(campaigns)} campaigns")
-    print(f"📊 Date range: {df['date'].min()} to {df['date'].max()}")
+    # Draw the number of records per (date, campaign) in one call:
+    # weekdays get 3-7 records, weekends 1-3
+    is_weekend_day = np.asarray(date_range.weekday >= 5)[:, None]
+    num_records = rng.integers(
+        np.where(is_weekend_day, 1, 3),
+        np.where(is_weekend_day, 4, 8),
+        size=(days, len(_CAMPAIGN_IDS))
+    ).ravel()
+    
+    # Expand the date and campaign attributes to one entry per record
+    day_idx = np.repeat(np.repeat(np.arange(days), len(_CAMPAIGN_IDS)), num_records)
+    campaign_idx = np.repeat(np.tile(np.arange(len(_CAMPAIGN_IDS)), days), num_records)
+    dates = date_range.values[day_idx]
+    is_weekend = is_weekend_day.ravel()[day_idx]
+    is_search = (_CAMPAIGN_TYPES == 'Search')[campaign_idx]
+    n = len(campaign_idx)
+    
+    # Base metrics with realistic relationships
+    impressions = rng.poisson(np.where(is_weekend, 600, 1000))
+    
+    # CTR, conversion rate, cost per click and revenue per conversion all
+    # vary by campaign type. Draw them as one (n, 4) block around the
+    # per-type means (row 0 Display, row 1 Search) and clip it in place
+    type_means = np.array([[0.005, 0.02, 0.8, 30], [0.02, 0.05, 2.5, 50]])
+    rates = rng.normal(type_means[is_search.astype(np.intp)], [0.005, 0.01, 0.5, 10])
+    np.clip(rates, [0.001, 0.001, 0.1, 5], [0.1, 0.2, np.inf, np.inf], out=rates)
+    ctr, conversion_rate, cpc, revenue_per_conversion = rates.T
+    
+    clicks = (impressions * ctr).astype(int)
+    conversions = (clicks * conversion_rate).astype(int)
+    cost = clicks * cpc
+    revenue = conversions * revenue_per_conversion
+    
+    # Select random attributes
+    device = rng.choice(_DEVICES, size=n, p=[0.4, 0.5, 0.1])  # Mobile is most common
+    location = rng.choice(_LOCATIONS, size=n)
+    
+    # Only search records carry a keyword, so draw just for those rows
+    keyword = np.full(n, 'display_ad', dtype=object)
+    keyword[is_search] = rng.choice(_KEYWORDS, size=np.count_nonzero(is_search))
+    
+    # Build the DataFrame in one go
+    df = pd.DataFrame({
+        'date': dates,
+        'campaign_id': _CAMPAIGN_IDS[campaign_idx],
+        'campaign_name': _CAMPAIGN_NAMES[campaign_idx],
+        'campaign_type': _CAMPAIGN_TYPES[campaign_idx],
+        'keyword': keyword,
+        'device': device,
+        'location': location,
+        'impressions': impressions,
+        'clicks': clicks,
+        'conversions': conversions,
+        'cost': np.round(cost, 2),
+        'revenue': np.round(revenue, 2)
+    })
+    
+    # Add derived metrics (zero denominators give 0 instead of inf/NaN)
+    df['ctr'] = np.round(_safe_divide(df['clicks'], df['impressions']) * 100, 2)
+    df['cpc'] = np.round(_safe_divide(df['cost'], df['clicks']), 2)
+    df['cpa'] = np.round(_safe_divide(df['cost'], df['conversions']), 2)
+    df['roas'] = np.round(_safe_divide(df['revenue'], df['cost']), 2)
+    df['conversion_rate'] = np.round(_safe_divide(df['conversions'], df['clicks']) * 100, 2)
+    
+    # Repeating labels are stored once per category and grouped on integer codes
+    for col in ['campaign_id', 'campaign_name', 'campaign_type', 'device', 'location', 'keyword']:
+        df[col] = df[col].astype('category')
+    
+    # Counts and money amounts fit comfortably in 32 bits, halving their memory
+    for col in ['impressions', 'clicks', 'conversions']:
+        df[col] = df[col].astype('int32')
+    for col in ['cost', 'revenue', 'ctr', 'cpc', 'cpa', 'roas', 'conversion_rate']:
+        df[col] = df[col].astype('float32')
+    
+    if verbose:
+        print(f"✅ Generated {len(df)} records across {len(_CAMPAIGN_IDS)} campaigns")
+        print(f"📊 Date range: {df['date'].min()} to {df['date'].max()}")
     
     return df
 
-def add_anomalies(df, anomaly_rate=0.05):
+def add_anomalies(df, anomaly_rate=0.05, inplace=False, verbose=True):
     """
     Add realistic anomalies to the data to simulate real-world issues.
     
     Parameters:
     - df: Input DataFrame
     - anomaly_rate: Percentage of records to modify with anomalies
+    - inplace: Modify df directly instead of returning a new DataFrame
+    - verbose: Print progress messages when True
     
     Returns:
     - DataFrame with anomalies added
     """
     
-    print("🔍 Adding realistic anomalies to simulate real-world data...")
-    
-    # Create a copy to avoid modifying original
-    df_anomaly = df.copy()
-    
-    # Select random records to add anomalies
-    anomaly_indices = np.random.choice(df.index, size=int(len(df) * anomaly_rate), replace=False)
-    
-    for idx in anomaly_indices:
-        anomaly_type = np.random.choice(['missing_data', 'outlier', 'data_error'])
-        
-        if anomaly_type == 'missing_data':
-            # Randomly set some values to NaN
-            field = np.random.choice(['clicks', 'conversions', 'cost'])
-            df_anomaly.loc[idx, field] = np.nan
-            
-        elif anomaly_type == 'outlier':
-            # Create extreme values
-            field = np.random.choice(['impressions', 'clicks', 'cost'])
-            if field == 'impressions':
-                df_anomaly.loc[idx, field] = np.random.randint(10000, 50000)
-            elif field == 'clicks':
-                df_anomaly.loc[idx, field] = np.random.randint(500, 2000)
-            else:  # cost
-                df_anomaly.loc[idx, field] = np.random.uniform(1000, 5000)
-                
-        elif anomaly_type == 'data_error':
-            # Create impossible values (negative clicks, etc.)
-            field = np.random.choice(['clicks', 'conversions'])
-            df_anomaly.loc[idx, field] = -1
-    
-    print(f"⚠️ Added anomalies to {len(anomaly_indices)} records")
+    if verbose:
+        print("🔍 Adding realistic anomalies to simulate real-world data...")
+    
+    if inplace:
+        df_anomaly = df
+    else:
+        # Only the metric columns are modified, so copy just those and
+        # share the remaining columns with the original
+        df_anomaly = df.copy(deep=False)
+        for col in ['impressions', 'clicks', 'conversions', 'cost']:
+            df_anomaly[col] = df[col].to_numpy(copy=True)
+    
+    # Select random records and draw the anomaly type and target field for each
+    anomaly_indices = rng.choice(len(df), size=int(len(df) * anomaly_rate), replace=False, shuffle=False)
+    anomaly_types = rng.choice(['missing_data', 'outlier', 'data_error'], size=len(anomaly_indices))
+    fields = np.select(
+        [anomaly_types == 'missing_data', anomaly_types == 'outlier'],
+        [rng.choice(['clicks', 'conversions', 'cost'], size=len(anomaly_indices)),
+         rng.choice(['impressions', 'clicks', 'cost'], size=len(anomaly_indices))],
+        rng.choice(['clicks', 'conversions'], size=len(anomaly_indices))
+    )
+    
+    # Count columns that can receive NaN have to be float
+    df_anomaly[['clicks', 'conversions']] = df_anomaly[['clicks', 'conversions']].astype('float32')
+    
+    # Missing data: randomly set some values to NaN
+    for field in ['clicks', 'conversions', 'cost']:
+        rows = anomaly_indices[(anomaly_types == 'missing_data') & (fields == field)]
+        df_anomaly.iloc[rows, df_anomaly.columns.get_loc(field)] = np.nan
+    
+    # Outliers: create extreme values
+    for field in ['impressions', 'clicks', 'cost']:
+        rows = anomaly_indices[(anomaly_types == 'outlier') & (fields == field)]
+        if field == 'impressions':
+            values = rng.integers(10000, 50000, size=len(rows))
+        elif field == 'clicks':
+            values = rng.integers(500, 2000, size=len(rows))
+        else:  # cost
+            values = rng.uniform(1000, 5000, size=len(rows))
+        df_anomaly.iloc[rows, df_anomaly.columns.get_loc(field)] = values.astype(df_anomaly[field].dtype)
+    
+    # Data errors: create impossible values (negative clicks, etc.)
+    for field in ['clicks', 'conversions']:
+        rows = anomaly_indices[(anomaly_types == 'data_error') & (fields == field)]
+        df_anomaly.iloc[rows, df_anomaly.columns.get_loc(field)] = -1
+    
+    if verbose:
+        print(f"⚠️ Added anomalies to {len(anomaly_indices)} records")
     return df_anomaly
 
-def save_data(df, filename='campaign_data.csv'):
+def save_data(df, filename='campaign_data.parquet', fmt='parquet', verbose=True):
     """
-    Save the generated data to a CSV file.
+    Save the generated data to a Parquet (default) or CSV file.
     
     Parameters:
     - df: DataFrame to save
-    - filename: Output filename
+    - filename: Output filename (the extension follows fmt)
+    - fmt: 'parquet' (Snappy-compressed, columnar) or 'csv'
+    - verbose: Print the output path and file size when True
+    
+    Returns:
+    - Path of the written file
     """
     
     # Ensure data directory exists
     os.makedirs('data', exist_ok=True)
     
-    filepath = os.path.join('data', filename)
-    df.to_csv(filepath, index=False)
+    filepath = os.path.splitext(os.path.join('data', filename))[0] + f'.{fmt}'
+    if fmt == 'parquet':
+        # The categorical columns are stored dictionary-encoded
+        df.to_parquet(filepath, engine='pyarrow', compression='snappy', index=False)
+    elif fmt == 'csv':
+        df.to_csv(filepath, index=False)
+    else:
+        raise ValueError(f"Unsupported output format: {fmt}")
     
-    print(f"💾 Data saved to {filepath}")
-    print(f"📁 File size: {os.path.getsize(filepath) / 1024:.1f} KB")
+    if verbose:
+        print(f"💾 Data saved to {filepath}")
+        print(f"📁 File size: {os.stat(filepath).st_size / 1024:.1f} KB")
     
     return filepath
 
@@ -256,23 +291,20 @@ if __name__ == "__main__":
     print("🚀 Starting Ad Campaign Data Generation")
     print("=" * 50)
     
-    # Generate clean data
-    df_clean = generate_campaign_data()
-    
-    # Add anomalies
-    df_with_anomalies = add_anomalies(df_clean)
-    
-    # Save both versions
-    clean_file = save_data(df_clean, 'campaign_data_clean.csv')
-    anomaly_file = save_data(df_with_anomalies, 'campaign_data_with_anomalies.csv')
+    # Generate clean data, add anomalies and save both versions quietly;
+    # a single summary is printed once everything is written
+    df_clean = generate_campaign_data(verbose=False)
+    df_with_anomalies = add_anomalies(df_clean, verbose=False)
+    clean_file = save_data(df_clean, 'campaign_data_clean.parquet', verbose=False)
+    anomaly_file = save_data(df_with_anomalies, 'campaign_data_with_anomalies.parquet', verbose=False)
     
     # Generate summary statistics
     generate_summary_stats(df_clean)
     
     print("\n🎉 Data generation complete!")
     print("📁 Files created:")
-    print(f"   - {clean_file} (clean data)")
-    print(f"   - {anomaly_file} (data with anomalies)")
+    print(f"   - {clean_file} (clean data, {os.stat(clean_file).st_size / 1024:.1f} KB)")
+    print(f"   - {anomaly_file} (data with anomalies, {os.stat(anomaly_file).st_size / 1024:.1f} KB)")
     
     print("\n💡 Next steps:")
     print("   1. Run data_processing.py to clean the data")
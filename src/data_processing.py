@@ -15,16 +15,34 @@ Key Concepts You'll Learn:
 import pandas as pd
 import numpy as np
 import os
+import shutil
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
-def load_data(filepath='data/campaign_data_with_anomalies.csv'):
+# Copy-on-Write lets the shallow copies below share column buffers until a
+# column is actually replaced (always on from pandas 3.0)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# Low-cardinality dimension columns, kept as categoricals so duplicate checks,
+# nunique and groupbys hash small integer codes instead of strings
+_DIMENSION_COLUMNS = ['campaign_id', 'campaign_name', 'campaign_type', 'keyword', 'device', 'location']
+
+# Fixed dtypes for partial CSV reads, so a chunk without missing counts doesn't
+# infer ints while another with them infers floats
+_CSV_DTYPES = {**dict.fromkeys(_DIMENSION_COLUMNS, 'category'),
+               **dict.fromkeys(['impressions', 'clicks', 'conversions', 'cost', 'revenue'], 'float64')}
+
+_DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+def load_data(filepath='data/campaign_data_with_anomalies.parquet'):
     """
-    Load the campaign data from CSV file.
+    Load the campaign data from a Parquet or CSV file.
     
     Parameters:
-    - filepath: Path to the CSV file
+    - filepath: Path to the Parquet or CSV file (a missing Parquet file falls
+      back to the CSV export of the same name)
     
     Returns:
     - DataFrame with campaign data
@@ -32,8 +50,18 @@ def load_data(filepath='data/campaign_data_with_anomalies.csv'):
     
     print("📂 Loading campaign data...")
     
+    csv_path = os.path.splitext(filepath)[0] + '.csv'
+    if filepath.endswith('.parquet') and not os.path.exists(filepath) and os.path.exists(csv_path):
+        filepath = csv_path
+    
     try:
-        df = pd.read_csv(filepath)
+        if filepath.endswith('.parquet'):
+            # The dimension columns are stored dictionary-encoded and load as categoricals
+            df = pd.read_parquet(filepath, engine='pyarrow')
+        else:
+            # The Arrow parser is multithreaded and parses dates during the read
+            df = pd.read_csv(filepath, engine='pyarrow', parse_dates=['date'],
+                             dtype=dict.fromkeys(_DIMENSION_COLUMNS, 'category'))
         print(f"✅ Successfully loaded {len(df):,} records")
         return df
     except FileNotFoundError:
@@ -57,10 +85,18 @@ def assess_data_quality(df):
     
     quality_report = {}
     
+    # Date range and unique counts in one aggregation
+    summary = df.agg({
+        'date': ['min', 'max'],
+        'campaign_id': 'nunique',
+        'device': 'nunique',
+        'location': 'nunique'
+    })
+    
     # Basic info
     quality_report['total_records'] = len(df)
     quality_report['total_columns'] = len(df.columns)
-    quality_report['date_range'] = f"{df['date'].min()} to {df['date'].max()}"
+    quality_report['date_range'] = f"{summary.loc['min', 'date']} to {summary.loc['max', 'date']}"
     
     # Missing values
     missing_data = df.isnull().sum()
@@ -69,14 +105,15 @@ def assess_data_quality(df):
     # Data types
     quality_report['data_types'] = df.dtypes.to_dict()
     
-    # Duplicate records
-    duplicates = df.duplicated().sum()
+    # Duplicate records, found on one 64-bit hash per row instead of comparing
+    # every column
+    duplicates = pd.util.hash_pandas_object(df, index=False).duplicated().sum()
     quality_report['duplicate_records'] = duplicates
     
     # Unique values
-    quality_report['unique_campaigns'] = df['campaign_id'].nunique()
-    quality_report['unique_devices'] = df['device'].nunique()
-    quality_report['unique_locations'] = df['location'].nunique()
+    quality_report['unique_campaigns'] = int(summary.loc['nunique', 'campaign_id'])
+    quality_report['unique_devices'] = int(summary.loc['nunique', 'device'])
+    quality_report['unique_locations'] = int(summary.loc['nunique', 'location'])
     
     # Print summary
     print(f"📊 Total Records: {quality_report['total_records']:,}")
@@ -100,167 +137,341 @@ def assess_data_quality(df):
     
     return quality_report
 
-def clean_data(df):
+def _safe_divide(numerator, denominator):
+    """
+    Divide element-wise without materializing infinities.
+    
+    Only the positions with a positive denominator are divided; the rest are
+    left at 0 in the preallocated output, so no inf/NaN is computed and then
+    masked away. The scripts don't import each other, so data_generation.py
+    and analysis.py keep their own copies, which always divide in float64.
+    This one keeps float32 inputs in float32 (and accepts the 2-D stacked KPI
+    arrays), since the processed KPI columns are stored as float32.
+    
+    Parameters:
+    - numerator: Series or array of numerators
+    - denominator: Series or array of denominators (same shape)
+    
+    Returns:
+    - NumPy array with the ratio, or 0 where the denominator is not positive
+    """
+    
+    numerator = np.asarray(numerator)
+    denominator = np.asarray(denominator)
+    out = np.zeros(numerator.shape, dtype=np.result_type(numerator, denominator, np.float32))
+    return np.divide(numerator, denominator, out=out, where=denominator > 0)
+
+def _fill_missing(df, col, value):
+    """
+    Replace the NaNs of one numeric column with a fixed value.
+    
+    Works on a copy of the column's NumPy buffer with np.nan_to_num, which
+    avoids the mask and block construction of Series.fillna.
+    
+    Parameters:
+    - df: DataFrame to update
+    - col: Column name
+    - value: Fill value
+    """
+    
+    values = df[col].to_numpy(copy=True)
+    np.nan_to_num(values, copy=False, nan=value, posinf=np.inf, neginf=-np.inf)
+    df[col] = values
+
+# KPI name -> (numerator, denominator, scale)
+_KPI_FORMULAS = {
+    'ctr': ('clicks', 'impressions', 100),
+    'cpc': ('cost', 'clicks', 1),
+    'cpa': ('cost', 'conversions', 1),
+    'roas': ('revenue', 'cost', 1),
+    'conversion_rate': ('conversions', 'clicks', 100),
+}
+
+def _recompute_kpis(df):
+    """
+    Recalculate the derived KPI columns from the base metrics.
+    
+    The numerators and denominators of all five KPIs are stacked into two
+    2-D arrays so the division, scaling and rounding each run once over the
+    whole block; rows with a zero denominator get 0 instead of inf/NaN.
+    The KPIs are stored as float32, which holds their two decimals exactly
+    enough for display and export at half the memory.
+    
+    Parameters:
+    - df: DataFrame with impressions, clicks, conversions, cost and revenue
+    
+    Returns:
+    - DataFrame with ctr, cpc, cpa, roas and conversion_rate recalculated
+    """
+    
+    numerators = np.column_stack([df[num].to_numpy(dtype=np.float64) for num, _, _ in _KPI_FORMULAS.values()])
+    denominators = np.column_stack([df[den].to_numpy(dtype=np.float64) for _, den, _ in _KPI_FORMULAS.values()])
+    scales = np.array([scale for _, _, scale in _KPI_FORMULAS.values()], dtype=np.float64)
+    
+    values = _safe_divide(numerators, denominators)
+    values *= scales
+    np.round(values, 2, out=values)
+    
+    # Narrow to a column-major float32 block so every KPI column is a
+    # contiguous slice
+    kpi_values = values.astype(np.float32, order='F')
+    
+    return df.assign(**{kpi: kpi_values[:, i] for i, kpi in enumerate(_KPI_FORMULAS)})
+
+def _iqr_bounds(values):
+    """
+    Compute the 1.5 x IQR outlier bounds of each column.
+    
+    Both quartiles of every column come from a single np.quantile call, which
+    partitions each column once for the two ranks instead of dispatching a
+    pandas quantile per column and quantile level.
+    
+    Parameters:
+    - values: DataFrame of numeric columns without missing values
+    
+    Returns:
+    - Tuple of (lower bounds, upper bounds) Series indexed by column
+    """
+    
+    if values.empty:
+        # No rows (or no columns): no bounds, like pandas' NaN quantiles
+        no_bound = pd.Series(np.nan, index=values.columns)
+        return no_bound, no_bound
+    
+    q1, q3 = np.quantile(values.to_numpy(dtype=np.float64), [0.25, 0.75], axis=0)
+    IQR = q3 - q1
+    return (pd.Series(q1 - 1.5 * IQR, index=values.columns),
+            pd.Series(q3 + 1.5 * IQR, index=values.columns))
+
+def compute_cleaning_stats(df):
+    """
+    Compute the dataset-wide fill values and outlier bounds used by clean_data.
+    
+    Only the base metric columns are needed, so a chunked run can read just
+    those columns first and then clean every chunk with the same values.
+    The steps mirror clean_data: fill missing values, drop negative rows,
+    then take the IQR bounds.
+    
+    Parameters:
+    - df: DataFrame with (at least) the base metric columns
+    
+    Returns:
+    - Dictionary with 'medians' (fill values) and 'bounds' (IQR caps) per column,
+      and 'capped' (the columns that have outliers anywhere in the file)
+    """
+    
+    metrics = df[['impressions', 'clicks', 'conversions', 'cost', 'revenue']]
+    medians = {col: metrics[col].median() for col in ['conversions', 'cost', 'revenue']}
+    
+    metrics = metrics.fillna({'impressions': 0, 'clicks': 0, **medians})
+    metrics = metrics[(metrics >= 0).all(axis=1)]
+    
+    lower_bound, upper_bound = _iqr_bounds(metrics[['impressions', 'clicks', 'cost']])
+    bounds = {col: (lower_bound[col], upper_bound[col]) for col in lower_bound.index}
+    capped = [col for col, (lower, upper) in bounds.items()
+              if ((metrics[col] < lower) | (metrics[col] > upper)).any()]
+    
+    return {'medians': medians, 'bounds': bounds, 'capped': capped}
+
+def clean_data(df, stats=None, duplicates=None, verbose=True):
     """
     Clean the campaign data by handling various data quality issues.
     
     Parameters:
     - df: Input DataFrame
+    - stats: Optional fill values and outlier bounds from compute_cleaning_stats
+      (used when cleaning one chunk of a larger file); computed from df if None
+    - duplicates: Duplicate count already found by assess_data_quality; when it
+      is 0 the deduplication pass is skipped
+    - verbose: Print each cleaning step when True
     
     Returns:
     - Cleaned DataFrame
     """
     
-    print("\n🧹 Cleaning Data...")
-    print("=" * 50)
+    if verbose:
+        print("\n🧹 Cleaning Data...")
+        print("=" * 50)
     
-    # Create a copy to avoid modifying original
-    df_clean = df.copy()
+    # Shallow copy: the original is left untouched without duplicating its data
+    df_clean = df.copy(deep=False)
     
-    # 1. Convert date column to datetime
-    df_clean['date'] = pd.to_datetime(df_clean['date'])
+    # 1. Convert date column to datetime (already parsed by load_data)
+    if not pd.api.types.is_datetime64_any_dtype(df_clean['date']):
+        df_clean['date'] = pd.to_datetime(df_clean['date'])
     
     # 2. Remove duplicate records
-    initial_count = len(df_clean)
-    df_clean = df_clean.drop_duplicates()
-    duplicates_removed = initial_count - len(df_clean)
-    if duplicates_removed > 0:
-        print(f"🗑️ Removed {duplicates_removed} duplicate records")
+    if duplicates is None or duplicates > 0:
+        initial_count = len(df_clean)
+        df_clean = df_clean.drop_duplicates()
+        duplicates_removed = initial_count - len(df_clean)
+        if verbose and duplicates_removed > 0:
+            print(f"🗑️ Removed {duplicates_removed} duplicate records")
     
     # 3. Handle missing values
-    print("\n🔧 Handling Missing Values:")
+    if verbose:
+        print("\n🔧 Handling Missing Values:")
     
     # For numeric columns, fill with median or 0
-    numeric_columns = ['impressions', 'clicks', 'conversions', 'cost', 'revenue']
-    
-    for col in numeric_columns:
-        if col in df_clean.columns and df_clean[col].isnull().sum() > 0:
-            missing_count = df_clean[col].isnull().sum()
-            
-            if col in ['impressions', 'clicks']:
-                # Fill with 0 for these metrics
-                df_clean[col] = df_clean[col].fillna(0)
+    numeric_columns = [col for col in ['impressions', 'clicks', 'conversions', 'cost', 'revenue']
+                       if col in df_clean.columns]
+    missing_counts = df_clean[numeric_columns].isnull().sum()
+    
+    for col, missing_count in missing_counts[missing_counts > 0].items():
+        if col in ['impressions', 'clicks']:
+            # Fill with 0 for these metrics
+            _fill_missing(df_clean, col, 0)
+            if verbose:
                 print(f"   {col}: Filled {missing_count} missing values with 0")
-            else:
-                # Fill with median for cost and revenue
-                median_val = df_clean[col].median()
-                df_clean[col] = df_clean[col].fillna(median_val)
+        else:
+            # Fill with median for cost and revenue
+            median_val = stats['medians'][col] if stats else df_clean[col].median()
+            _fill_missing(df_clean, col, median_val)
+            if verbose:
                 print(f"   {col}: Filled {missing_count} missing values with median ({median_val:.2f})")
     
     # 4. Handle outliers and data errors
-    print("\n🔍 Handling Outliers and Data Errors:")
-    
-    # Remove negative values (impossible in advertising)
-    for col in ['impressions', 'clicks', 'conversions', 'cost', 'revenue']:
-        if col in df_clean.columns:
-            negative_count = (df_clean[col] < 0).sum()
-            if negative_count > 0:
-                df_clean = df_clean[df_clean[col] >= 0]
+    if verbose:
+        print("\n🔍 Handling Outliers and Data Errors:")
+    
+    # Remove negative values (impossible in advertising); one min() reduction
+    # per column rules out the columns that have none, and the rest share one
+    # 2-D mask and a single row filter
+    negative_columns = [col for col in ['impressions', 'clicks', 'conversions', 'cost', 'revenue']
+                        if col in df_clean.columns]
+    column_mins = df_clean[negative_columns].min()
+    negative_columns = column_mins.index[column_mins < 0]
+    if len(negative_columns) > 0:
+        negative = df_clean[negative_columns].to_numpy() < 0
+        df_clean = df_clean[~negative.any(axis=1)]
+        if verbose:
+            for col, negative_count in zip(negative_columns, negative.sum(axis=0)):
                 print(f"   {col}: Removed {negative_count} negative values")
     
-    # Handle extreme outliers using IQR method
-    for col in ['impressions', 'clicks', 'cost']:
-        if col in df_clean.columns:
-            Q1 = df_clean[col].quantile(0.25)
-            Q3 = df_clean[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            
-            outliers = ((df_clean[col] < lower_bound) | (df_clean[col] > upper_bound)).sum()
-            if outliers > 0:
-                # Cap outliers instead of removing them
-                df_clean[col] = df_clean[col].clip(lower=lower_bound, upper=upper_bound)
-                print(f"   {col}: Capped {outliers} outliers using IQR method")
+    # Handle extreme outliers using IQR method (one quantile call for all columns)
+    outlier_columns = [col for col in ['impressions', 'clicks', 'cost'] if col in df_clean.columns]
+    if outlier_columns:
+        values = df_clean[outlier_columns]
+        extremes = values.agg(['min', 'max'])
+        if stats:
+            lower_bound = pd.Series({col: stats['bounds'][col][0] for col in outlier_columns})
+            upper_bound = pd.Series({col: stats['bounds'][col][1] for col in outlier_columns})
+        else:
+            # A constant column has a zero IQR and nothing to cap, so skip its quantiles
+            varying = extremes.columns[extremes.loc['max'] > extremes.loc['min']]
+            lower_bound, upper_bound = _iqr_bounds(values[varying])
+        
+        # Only columns whose min/max fall outside the bounds need the element-wise mask
+        bounded = lower_bound.index
+        candidates = bounded[(extremes.loc['min', bounded] < lower_bound) | (extremes.loc['max', bounded] > upper_bound)]
+        candidate_values = values[candidates]
+        outlier_counts = ((candidate_values < lower_bound[candidates]) |
+                          (candidate_values > upper_bound[candidates])).sum()
+        capped = outlier_counts.index[outlier_counts > 0]
+        if stats:
+            # Clip the columns a whole-file run would clip, even when this chunk
+            # has no outliers, so every chunk comes out with the same dtypes
+            capped = pd.Index([col for col in stats['capped'] if col in outlier_columns])
+        if len(capped) > 0:
+            # Cap outliers instead of removing them. The capped columns always
+            # become float (clip only upcasts an int column when a value changes);
+            # float32 columns stay float32 so the 64-bit bounds don't upcast them
+            capped_dtypes = {col: np.float32 if values[col].dtype == np.float32 else np.float64
+                             for col in capped}
+            df_clean[capped] = (
+                values[capped]
+                .clip(lower=lower_bound[capped], upper=upper_bound[capped], axis=1)
+                .astype(capped_dtypes)
+            )
+            if verbose:
+                for col, outliers in outlier_counts[outlier_counts > 0].items():
+                    print(f"   {col}: Capped {outliers} outliers using IQR method")
     
     # 5. Recalculate derived metrics
-    print("\n📊 Recalculating Derived Metrics:")
-    
-    # Ensure we don't divide by zero and handle NaN values
-    df_clean['ctr'] = np.where(
-        df_clean['impressions'] > 0,
-        (df_clean['clicks'] / df_clean['impressions'] * 100).round(2),
-        0
-    )
-    df_clean['ctr'] = df_clean['ctr'].fillna(0)
-    
-    df_clean['cpc'] = np.where(
-        df_clean['clicks'] > 0,
-        (df_clean['cost'] / df_clean['clicks']).round(2),
-        0
-    )
-    df_clean['cpc'] = df_clean['cpc'].fillna(0)
-    
-    df_clean['cpa'] = np.where(
-        df_clean['conversions'] > 0,
-        (df_clean['cost'] / df_clean['conversions']).round(2),
-        0
-    )
-    df_clean['cpa'] = df_clean['cpa'].fillna(0)
-    
-    df_clean['roas'] = np.where(
-        df_clean['cost'] > 0,
-        (df_clean['revenue'] / df_clean['cost']).round(2),
-        0
-    )
-    df_clean['roas'] = df_clean['roas'].fillna(0)
+    if verbose:
+        print("\n📊 Recalculating Derived Metrics:")
     
-    df_clean['conversion_rate'] = np.where(
-        df_clean['clicks'] > 0,
-        (df_clean['conversions'] / df_clean['clicks'] * 100).round(2),
-        0
-    )
-    df_clean['conversion_rate'] = df_clean['conversion_rate'].fillna(0)
+    df_clean = _recompute_kpis(df_clean)
     
-    print("   ✅ All KPIs recalculated")
+    if verbose:
+        print("   ✅ All KPIs recalculated")
     
     # 6. Data validation
-    print("\n✅ Data Validation:")
+    if verbose:
+        print("\n✅ Data Validation:")
     
     # Check for logical inconsistencies
     invalid_ctr = (df_clean['ctr'] > 100).sum()
     if invalid_ctr > 0:
-        print(f"   ⚠️ Found {invalid_ctr} records with CTR > 100%")
+        if verbose:
+            print(f"   ⚠️ Found {invalid_ctr} records with CTR > 100%")
         df_clean['ctr'] = df_clean['ctr'].clip(upper=100)
     
     invalid_cvr = (df_clean['conversion_rate'] > 100).sum()
     if invalid_cvr > 0:
-        print(f"   ⚠️ Found {invalid_cvr} records with Conversion Rate > 100%")
+        if verbose:
+            print(f"   ⚠️ Found {invalid_cvr} records with Conversion Rate > 100%")
         df_clean['conversion_rate'] = df_clean['conversion_rate'].clip(upper=100)
     
-    print("   ✅ All logical checks passed")
+    if verbose:
+        print("   ✅ All logical checks passed")
     
     return df_clean
 
-def add_features(df):
+def _categorize(values, bins, labels):
+    """
+    Bin values into labelled categories, matching pd.cut with right-closed bins.
+    
+    Uses a binary search over the bin edges instead of building an IntervalIndex;
+    values outside (bins[0], bins[-1]] and NaNs get a missing category.
+    
+    Parameters:
+    - values: Series of values to bin
+    - bins: Sorted bin edges
+    - labels: One label per bin
+    
+    Returns:
+    - Ordered Categorical with the bin label of each value
+    """
+    
+    codes = np.searchsorted(bins, values.to_numpy(), side='left') - 1
+    codes[codes >= len(labels)] = -1
+    return pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+
+def add_features(df, verbose=True):
     """
     Add useful features for analysis.
     
     Parameters:
     - df: Input DataFrame
+    - verbose: Print the added feature groups when True
     
     Returns:
     - DataFrame with additional features
     """
     
-    print("\n🔧 Adding Analysis Features...")
+    if verbose:
+        print("\n🔧 Adding Analysis Features...")
     
-    df_features = df.copy()
+    df_features = df.copy(deep=False)
     
-    # 1. Time-based features
-    df_features['day_of_week'] = df_features['date'].dt.day_name()
-    df_features['month'] = df_features['date'].dt.month
-    df_features['week'] = df_features['date'].dt.isocalendar().week
-    df_features['is_weekend'] = df_features['date'].dt.weekday >= 5
+    # 1. Time-based features (computed once per distinct day, then broadcast to the rows)
+    unique_dates, date_codes = np.unique(df_features['date'].to_numpy(), return_inverse=True)
+    calendar = pd.DatetimeIndex(unique_dates)
+    df_features['day_of_week'] = pd.Categorical.from_codes(calendar.weekday.to_numpy()[date_codes],
+                                                           categories=_DAY_NAMES)
+    df_features['month'] = calendar.month.to_numpy()[date_codes]
+    df_features['week'] = calendar.isocalendar()['week'].array[date_codes]
+    df_features['is_weekend'] = (calendar.weekday >= 5)[date_codes]
     
     # 2. Performance categories
-    df_features['ctr_category'] = pd.cut(
+    df_features['ctr_category'] = _categorize(
         df_features['ctr'], 
         bins=[0, 1, 2, 5, 100], 
         labels=['Low', 'Medium', 'High', 'Very High']
     )
     
-    df_features['roas_category'] = pd.cut(
+    df_features['roas_category'] = _categorize(
         df_features['roas'], 
         bins=[0, 1, 2, 5, 100], 
         labels=['Poor', 'Break-even', 'Good', 'Excellent']
@@ -270,15 +481,14 @@ def add_features(df):
     df_features['cost_per_impression'] = (df_features['cost'] / df_features['impressions']).round(4)
     
     # 4. Revenue efficiency
-    df_features['revenue_per_click'] = np.where(
-        df_features['clicks'] > 0,
-        (df_features['revenue'] / df_features['clicks']).round(2),
-        0
+    df_features['revenue_per_click'] = np.round(
+        _safe_divide(df_features['revenue'], df_features['clicks']), 2
     )
     
-    print("   ✅ Added time-based features")
-    print("   ✅ Added performance categories")
-    print("   ✅ Added efficiency metrics")
+    if verbose:
+        print("   ✅ Added time-based features")
+        print("   ✅ Added performance categories")
+        print("   ✅ Added efficiency metrics")
     
     return df_features
 
@@ -297,27 +507,31 @@ def validate_cleaned_data(df):
     
     issues = []
     
-    # Check for missing values in base metrics only
+    # Each check only asks whether a bad value exists, so column minima and
+    # maxima answer them all without building per-check boolean masks
     base_metrics = ['impressions', 'clicks', 'conversions', 'cost', 'revenue']
+    metric_mins = df[[col for col in base_metrics if col in df.columns]].min()
+    kpi_maxes = df[['ctr', 'conversion_rate']].max()
+    dates = df['date'].agg(['min', 'max'])
+    
+    # Check for missing values in base metrics only
     missing_base = df[base_metrics].isnull().sum().sum()
     if missing_base > 0:
         issues.append(f"Still have {missing_base} missing values in base metrics")
     
     # Check for negative values
-    numeric_cols = ['impressions', 'clicks', 'conversions', 'cost', 'revenue']
-    for col in numeric_cols:
-        if col in df.columns and (df[col] < 0).any():
-            issues.append(f"Found negative values in {col}")
+    for col in metric_mins.index[metric_mins < 0]:
+        issues.append(f"Found negative values in {col}")
     
     # Check for impossible KPIs
-    if (df['ctr'] > 100).any():
+    if kpi_maxes['ctr'] > 100:
         issues.append("Found CTR values > 100%")
     
-    if (df['conversion_rate'] > 100).any():
+    if kpi_maxes['conversion_rate'] > 100:
         issues.append("Found Conversion Rate values > 100%")
     
     # Check date range
-    if df['date'].min() > df['date'].max():
+    if dates['min'] > dates['max']:
         issues.append("Date range is invalid")
     
     if issues:
@@ -329,33 +543,210 @@ def validate_cleaned_data(df):
         print("   ✅ All validation checks passed")
         return True
 
-def save_processed_data(df, filename='campaign_data_processed.csv'):
+def save_processed_data(df, filename='campaign_data_processed.parquet', fmt='parquet'):
     """
-    Save the processed data to a CSV file.
+    Save the processed data to a Parquet (default) or CSV file.
     
     Parameters:
-    - df: DataFrame to save
-    - filename: Output filename
+    - df: DataFrame to save, or an iterable of DataFrame chunks that are
+      written one after another into the same file
+    - filename: Output filename (the extension follows fmt)
+    - fmt: 'parquet' (zstd-compressed, columnar) or 'csv'
+    
+    Returns:
+    - Path of the written file
     """
     
     # Ensure data directory exists
     os.makedirs('data', exist_ok=True)
     
-    filepath = os.path.join('data', filename)
-    df.to_csv(filepath, index=False)
+    if fmt not in ('parquet', 'csv'):
+        raise ValueError(f"Unsupported output format: {fmt}")
+    
+    filepath = os.path.splitext(os.path.join('data', filename))[0] + f'.{fmt}'
+    
+    # Replace a partitioned dataset directory left by process_with_dask
+    if os.path.isdir(filepath):
+        shutil.rmtree(filepath)
+    
+    if isinstance(df, pd.DataFrame) and fmt == 'parquet':
+        df.to_parquet(filepath, engine='pyarrow', compression='zstd', index=False)
+    else:
+        # Chunks stream through one open Arrow writer; Arrow's CSV writer also
+        # formats whole column buffers in C++ instead of row by row in Python
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+        import pyarrow.parquet as pq
+        
+        chunks = [df] if isinstance(df, pd.DataFrame) else df
+        schema = None
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                if writer is None:
+                    schema = table.schema
+                    if fmt == 'parquet':
+                        writer = pq.ParquetWriter(filepath, schema, compression='zstd')
+                    else:
+                        writer = pacsv.CSVWriter(filepath, schema.set(
+                            schema.get_field_index('date'), pa.field('date', pa.date32())))
+                if fmt == 'csv':
+                    # Write plain dates rather than midnight timestamps
+                    date_index = table.schema.get_field_index('date')
+                    table = table.set_column(date_index, 'date', table['date'].cast(pa.date32()))
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
     
     print(f"\n💾 Processed data saved to {filepath}")
     print(f"📁 File size: {os.path.getsize(filepath) / 1024:.1f} KB")
     
     return filepath
 
-def generate_processing_summary(df_original, df_cleaned):
+def _iter_chunks(filepath, chunksize):
+    """
+    Read a Parquet or CSV file as a sequence of DataFrame chunks.
+    
+    Parameters:
+    - filepath: Path to the Parquet or CSV file
+    - chunksize: Number of rows per chunk
+    
+    Returns:
+    - Iterator of DataFrames
+    """
+    
+    if filepath.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        
+        for batch in pq.ParquetFile(filepath).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(filepath, chunksize=chunksize, parse_dates=['date'], dtype=_CSV_DTYPES)
+
+def process_in_chunks(filepath='data/campaign_data_with_anomalies.parquet', chunksize=256_000, fmt='parquet'):
+    """
+    Clean, enrich and save a large file chunk by chunk to bound peak memory.
+    
+    A first pass reads only the base metric columns to compute the fill values
+    and outlier bounds for the whole file; the second pass streams the chunks
+    through clean_data and add_features straight into the output file.
+    Duplicates are only detected within a chunk.
+    
+    Parameters:
+    - filepath: Path to the Parquet or CSV input file
+    - chunksize: Number of rows per chunk
+    - fmt: Output format, 'parquet' or 'csv'
+    
+    Returns:
+    - Path of the processed file
+    """
+    
+    print(f"📂 Processing {filepath} in chunks of {chunksize:,} rows...")
+    
+    stats = _read_cleaning_stats(filepath)
+    chunks = (_process_chunk(chunk, stats) for chunk in _iter_chunks(filepath, chunksize))
+    return save_processed_data(chunks, fmt=fmt)
+
+def _read_cleaning_stats(filepath):
+    """
+    Compute the cleaning stats of a file from its base metric columns only.
+    
+    Parameters:
+    - filepath: Path to the Parquet or CSV input file
+    
+    Returns:
+    - Dictionary from compute_cleaning_stats
+    """
+    
+    metric_columns = ['impressions', 'clicks', 'conversions', 'cost', 'revenue']
+    if filepath.endswith('.parquet'):
+        metrics = pd.read_parquet(filepath, engine='pyarrow', columns=metric_columns)
+    else:
+        metrics = pd.read_csv(filepath, engine='pyarrow', usecols=metric_columns)
+    return compute_cleaning_stats(metrics)
+
+def _process_chunk(chunk, stats):
+    """
+    Clean and enrich one chunk (or Dask partition) with dataset-wide stats.
+    
+    Parameters:
+    - chunk: DataFrame chunk
+    - stats: Dictionary from compute_cleaning_stats
+    
+    Returns:
+    - Processed DataFrame chunk
+    """
+    
+    return add_features(clean_data(chunk, stats=stats, verbose=False), verbose=False)
+
+def process_with_dask(filepath='data/campaign_data_with_anomalies.parquet', blocksize='64MB', fmt='parquet'):
+    """
+    Clean, enrich and save the data partition-parallel across cores with Dask.
+    
+    The fill values and outlier bounds are computed once for the whole file
+    (as in process_in_chunks), then every partition is processed independently
+    with map_partitions. Parquet output is written as a dataset directory with
+    one file per partition, which pd.read_parquet reads like a single file;
+    CSV output is streamed into one file. Duplicates are only detected within a partition.
+    
+    Parameters:
+    - filepath: Path to the Parquet or CSV input file
+    - blocksize: Target CSV partition size
+    - fmt: Output format, 'parquet' or 'csv'
+    
+    Returns:
+    - Path of the processed file, or None if Dask is not installed
+    """
+    
+    try:
+        import dask.dataframe as dd
+    except ImportError:
+        print("⚠️ Dask is not installed, processing with pandas instead")
+        return None
+    
+    if fmt not in ('parquet', 'csv'):
+        raise ValueError(f"Unsupported output format: {fmt}")
+    
+    print(f"📂 Processing {filepath} with Dask...")
+    
+    if filepath.endswith('.parquet'):
+        ddf = dd.read_parquet(filepath)
+    else:
+        ddf = dd.read_csv(filepath, blocksize=blocksize, parse_dates=['date'], dtype=_CSV_DTYPES)
+    
+    # Process the empty meta frame to give map_partitions the exact output
+    # schema, instead of letting Dask infer it from made-up sample rows
+    stats = _read_cleaning_stats(filepath)
+    processed = ddf.map_partitions(_process_chunk, stats, meta=_process_chunk(ddf._meta, stats))
+    
+    if fmt == 'csv':
+        # A single CSV file is written one partition after another anyway, so
+        # stream them through the same Arrow writer as the pandas path to get
+        # byte-identical output
+        return save_processed_data((partition.compute() for partition in processed.to_delayed()), fmt='csv')
+    
+    os.makedirs('data', exist_ok=True)
+    filepath = os.path.join('data', 'campaign_data_processed.parquet')
+    # Replace a single-file export from an earlier pandas run
+    if os.path.isfile(filepath):
+        os.remove(filepath)
+    processed.to_parquet(filepath, compression='zstd', write_index=False, overwrite=True)
+    
+    print(f"\n💾 Processed data saved to {filepath} ({processed.npartitions} partitions)")
+    
+    return filepath
+
+def generate_processing_summary(df_original, df_cleaned, quality_report=None):
     """
     Generate a summary of the data processing steps.
     
     Parameters:
     - df_original: Original DataFrame
     - df_cleaned: Cleaned DataFrame
+    - quality_report: Report from assess_data_quality; its missing-value and
+      duplicate counts are reused instead of scanning the original rows again
     """
     
     print("\n📈 Processing Summary:")
@@ -366,8 +757,17 @@ def generate_processing_summary(df_original, df_cleaned):
     print(f"Records Removed: {len(df_original) - len(df_cleaned):,}")
     
     print(f"\nData Quality Improvements:")
-    print(f"  - Missing values: {df_original.isnull().sum().sum()} → {df_cleaned.isnull().sum().sum()}")
-    print(f"  - Duplicates: {df_original.duplicated().sum()} → {df_cleaned.duplicated().sum()}")
+    # Reuse the original counts from the quality report when available;
+    # clean_data drops every duplicate, so the cleaned side is always 0
+    if quality_report is not None:
+        original_missing = sum(quality_report['missing_values'].values())
+        original_duplicates = quality_report['duplicate_records']
+    else:
+        original_missing = df_original.isnull().sum().sum()
+        original_duplicates = df_original.duplicated().sum()
+    
+    print(f"  - Missing values: {original_missing} → {df_cleaned.isnull().sum().sum()}")
+    print(f"  - Duplicates: {original_duplicates} → 0")
     
     print(f"\nKPI Ranges (Cleaned Data):")
     print(f"  - CTR: {df_cleaned['ctr'].min():.2f}% - {df_cleaned['ctr'].max():.2f}%")
@@ -382,6 +782,25 @@ if __name__ == "__main__":
     print("🚀 Starting Ad Campaign Data Processing")
     print("=" * 50)
     
+    # Processed data is written as Parquet; PROCESSED_FORMAT=csv keeps the CSV export
+    output_format = os.environ.get('PROCESSED_FORMAT', 'parquet')
+    
+    # PROCESSING_BACKEND=dask processes partitions in parallel across cores
+    if os.environ.get('PROCESSING_BACKEND') == 'dask':
+        processed_file = process_with_dask(fmt=output_format)
+        if processed_file:
+            print("\n🎉 Data processing complete!")
+            print(f"📁 Files created:\n   - {processed_file} (processed data)")
+            exit(0)
+    
+    # Large inputs can be streamed through the pipeline in chunks instead
+    chunksize = os.environ.get('PROCESSING_CHUNKSIZE')
+    if chunksize:
+        processed_file = process_in_chunks(chunksize=int(chunksize), fmt=output_format)
+        print("\n🎉 Data processing complete!")
+        print(f"📁 Files created:\n   - {processed_file} (processed data)")
+        exit(0)
+    
     # Load data
     df = load_data()
     if df is None:
@@ -391,7 +810,7 @@ if __name__ == "__main__":
     quality_report = assess_data_quality(df)
     
     # Clean data
-    df_cleaned = clean_data(df)
+    df_cleaned = clean_data(df, duplicates=quality_report['duplicate_records'])
     
     # Add features
     df_processed = add_features(df_cleaned)
@@ -401,10 +820,10 @@ if __name__ == "__main__":
     
     if is_valid:
         # Save processed data
-        processed_file = save_processed_data(df_processed)
+        processed_file = save_processed_data(df_processed, fmt=output_format)
         
         # Generate summary
-        generate_processing_summary(df, df_processed)
+        generate_processing_summary(df, df_processed, quality_report)
         
         print("\n🎉 Data processing complete!")
         print("📁 Files created:")
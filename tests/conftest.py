@@ -0,0 +1,27 @@
+"""
+Shared pytest setup: the pipeline scripts live in src/ and are imported as
+top-level modules, the same way they import each other when run directly.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+@pytest.fixture
+def campaign_file(tmp_path, monkeypatch):
+    """
+    Generate a small campaign dataset (with anomalies) in a temporary data/ folder.
+    
+    Returns:
+    - Path of the generated Parquet file
+    """
+    
+    import data_generation
+    
+    monkeypatch.chdir(tmp_path)
+    df = data_generation.generate_campaign_data(days=30, verbose=False)
+    df = data_generation.add_anomalies(df, verbose=False)
+    return data_generation.save_data(df, 'campaign_data_with_anomalies.parquet', verbose=False)
@@ -0,0 +1,85 @@
+"""
+Tests for the campaign analysis rollups.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import analysis
+import data_processing
+
+@pytest.fixture
+def processed_data(campaign_file):
+    """
+    Clean the generated campaign data and load it the way analysis.py does.
+    
+    Returns:
+    - Processed DataFrame as returned by load_processed_data
+    """
+    
+    df = data_processing.load_data(campaign_file)
+    df = data_processing.add_features(data_processing.clean_data(df, verbose=False), verbose=False)
+    return analysis.load_processed_data(data_processing.save_processed_data(df))
+
+def test_overall_totals_include_rows_with_missing_dimensions(processed_data):
+    df = processed_data
+    rng = np.random.default_rng(0)
+    for col in ('campaign_type', 'device', 'location'):
+        df[col] = df[col].mask(rng.random(len(df)) < 0.05)
+    
+    kpis = analysis.calculate_overall_kpis(analysis._aggregate_base(df), verbose=False)
+    
+    expected = df[['impressions', 'clicks', 'conversions', 'cost', 'revenue']].astype('float64').sum()
+    for col in expected.index:
+        assert kpis[f'total_{col}'] == pytest.approx(expected[col], rel=1e-12)
+
+def test_time_trends_do_not_depend_on_row_order(processed_data):
+    df = processed_data
+    shuffled = df.sample(frac=1, random_state=0)
+    
+    expected, expected_trend = analysis.analyze_time_trends(df, verbose=False)
+    result, trend = analysis.analyze_time_trends(shuffled, verbose=False)
+    
+    assert result['date'].is_monotonic_increasing
+    pd.testing.assert_frame_equal(result, expected)
+    assert trend == pytest.approx(expected_trend)
+
+def test_money_totals_match_float64_source_sums(campaign_file):
+    df = data_processing.load_data(campaign_file)
+    df = data_processing.add_features(data_processing.clean_data(df, verbose=False), verbose=False)
+    filepath = data_processing.save_processed_data(df, fmt='csv')
+    
+    # Sum the exported values as float64, before load_processed_data downcasts them
+    source = pd.read_csv(filepath, engine='pyarrow')
+    base = analysis._aggregate_base(analysis.load_processed_data(filepath))
+    
+    # Half a float32 ulp: a total accumulated or returned in float32 cannot
+    # stay this close, while rounding each row to float32 on load averages out
+    # well inside it
+    rel = 2.0 ** -26
+    
+    kpis = analysis.calculate_overall_kpis(base, verbose=False)
+    for col in ('cost', 'revenue'):
+        assert kpis[f'total_{col}'] == pytest.approx(source[col].sum(), rel=rel)
+    
+    for analyze, key in ((analysis.analyze_campaign_performance, 'campaign_name'),
+                         (analysis.analyze_device_performance, 'device'),
+                         (analysis.analyze_location_performance, 'location')):
+        result = analyze(base, verbose=False).set_index(key)
+        expected = source.groupby(key)[['cost', 'revenue']].sum()
+        for col in ('cost', 'revenue'):
+            assert result[col].to_dict() == pytest.approx(expected[col].to_dict(), rel=rel)
+
+def test_anomaly_z_scores_match_sample_std(processed_data):
+    daily = analysis._daily_aggregate(processed_data)
+    anomalies = analysis.detect_anomalies(processed_data, threshold=1.0, daily=daily, verbose=False)
+    
+    values = daily.set_index('date')[['impressions', 'clicks', 'revenue']].astype('float64')
+    z_scores = ((values - values.mean()) / values.std(ddof=1)).abs()
+    for row in anomalies[anomalies['metric'].isin(values.columns)].itertuples():
+        assert row.z_score == pytest.approx(z_scores.loc[row.date, row.metric], rel=1e-9)
+    
+    counts = anomalies['metric'].value_counts()
+    for col in values.columns:
+        assert counts.get(col, 0) == (z_scores[col] > 1.0).sum()
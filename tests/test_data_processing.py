@@ -0,0 +1,47 @@
+"""
+Tests for the data processing pipeline.
+"""
+
+import pandas as pd
+import pytest
+
+import data_generation
+import data_processing
+
+def _read_processed(filepath):
+    if filepath.endswith('.parquet'):
+        return pd.read_parquet(filepath)
+    return pd.read_csv(filepath, engine='pyarrow', parse_dates=['date'])
+
+@pytest.mark.parametrize('chunksize', [20, 100])
+@pytest.mark.parametrize('fmt', ['parquet', 'csv'])
+@pytest.mark.parametrize('input_fmt', ['parquet', 'csv'])
+def test_chunked_output_matches_in_memory(campaign_file, input_fmt, chunksize, fmt):
+    if input_fmt == 'csv':
+        campaign_file = data_generation.save_data(pd.read_parquet(campaign_file), 'campaign_data_with_anomalies',
+                                                  fmt='csv', verbose=False)
+    
+    df = data_processing.load_data(campaign_file)
+    df_processed = data_processing.add_features(data_processing.clean_data(df, verbose=False), verbose=False)
+    expected = _read_processed(data_processing.save_processed_data(df_processed, 'in_memory', fmt=fmt))
+    
+    chunked = _read_processed(data_processing.process_in_chunks(campaign_file, chunksize=chunksize, fmt=fmt))
+    
+    pd.testing.assert_frame_equal(chunked, expected, check_categorical=False)
+
+@pytest.mark.parametrize('fmt', ['parquet', 'csv'])
+@pytest.mark.parametrize('input_fmt', ['parquet', 'csv'])
+def test_dask_output_matches_in_memory(campaign_file, input_fmt, fmt):
+    pytest.importorskip('dask.dataframe')
+    if input_fmt == 'csv':
+        campaign_file = data_generation.save_data(pd.read_parquet(campaign_file), 'campaign_data_with_anomalies',
+                                                  fmt='csv', verbose=False)
+    
+    df = data_processing.load_data(campaign_file)
+    df_processed = data_processing.add_features(data_processing.clean_data(df, verbose=False), verbose=False)
+    expected = _read_processed(data_processing.save_processed_data(df_processed, 'in_memory', fmt=fmt))
+    
+    # A small blocksize splits the CSV input into several partitions
+    result = _read_processed(data_processing.process_with_dask(campaign_file, blocksize=20_000, fmt=fmt))
+    
+    pd.testing.assert_frame_equal(result, expected, check_categorical=False)